@@ -0,0 +1,134 @@
+import argparse
+import time
+from datetime import date
+
+from sqlalchemy import select
+
+from .config import settings
+from .crud import transaction as transaction_crud
+from .database import SessionLocal
+from .models.user import AccountPurge, User
+from .services import partitions, purge
+
+# Tarefas administrativas: `python -m app.cli <comando>`. Usam o mesmo
+# DATABASE_URL da aplicação.
+
+def _user_ids(db, user_id):
+    if user_id is not None:
+        return [user_id]
+    return db.execute(select(User.id).order_by(User.id)).scalars().all()
+
+def rebuild_spend(args):
+    # Um usuário por transação: os locks duram só o recálculo de cada um e
+    # escritas concorrentes continuam corretas (ver crud.transaction.apply_spend)
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        user_ids = _user_ids(db, args.user_id)
+        rows = 0
+        for user_id in user_ids:
+            rows += transaction_crud.rebuild_category_spend(db, user_id)
+            db.commit()
+    finally:
+        db.close()
+    print(f"{len(user_ids)} usuário(s), {rows} contador(es) em {time.perf_counter() - started:.1f}s")
+
+def archive(args):
+    # Por usuário: devolve o que estiver no arquivo depois do corte (se
+    # ARCHIVE_AFTER_DAYS aumentou) e arquiva o que ficou antes dele
+    started = time.perf_counter()
+    cutoff = transaction_crud.archive_cutoff()
+    db = SessionLocal()
+    try:
+        user_ids = _user_ids(db, args.user_id)
+        archived = restored = 0
+        for user_id in user_ids:
+            restored += transaction_crud.restore_user_transactions(db, user_id, cutoff)
+            archived += transaction_crud.archive_user_transactions(db, user_id, cutoff, args.batch_size)
+    finally:
+        db.close()
+    print(
+        f"{len(user_ids)} usuário(s), {archived} transação(ões) arquivada(s) e {restored} restaurada(s) "
+        f"(corte {cutoff:%Y-%m-%d}) em {time.perf_counter() - started:.1f}s"
+    )
+
+def maintain_partitions(args):
+    # Cria as partições que faltam entre o corte do arquivo e os próximos
+    # meses e remove as antigas que o arquivamento esvaziou (PostgreSQL com
+    # a migração 0010)
+    cutoff = transaction_crud.archive_cutoff().date()
+    db = SessionLocal()
+    try:
+        if not partitions.is_partitioned(db):
+            print("transactions não é particionada; nada a fazer")
+            return
+        through = partitions.add_months(date.today().replace(day=1), args.months_ahead)
+        created = partitions.create_partitions(db, cutoff, through)
+        dropped = partitions.drop_empty_partitions(db, cutoff)
+    finally:
+        db.close()
+    print(f"criadas: {', '.join(created) or '-'}; removidas: {', '.join(dropped) or '-'}")
+
+def purge_accounts(args):
+    # Sem --user-id, retoma as exclusões de contas pendentes, com falha ou
+    # paradas há mais de --stale-minutes (worker reiniciado no meio). Com
+    # --user-id, inicia a exclusão desse usuário e a executa aqui
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        if args.user_id is None:
+            purge_ids = purge.get_unfinished_purge_ids(db)
+        elif db.get(User, args.user_id) is None:
+            print(f"usuário {args.user_id} não encontrado")
+            return
+        else:
+            purge_ids = [purge.start_account_purge(db, args.user_id).id]
+        # Cada exclusão usa a própria sessão; esta não segura a leitura
+        db.commit()
+        skipped = [
+            purge_id
+            for purge_id in purge_ids
+            if not purge.run_account_purge(purge_id, args.batch_size, args.stale_minutes)
+        ]
+        for account_purge in db.execute(select(AccountPurge).where(AccountPurge.id.in_(purge_ids))).scalars():
+            state = "em andamento em outro processo" if account_purge.id in skipped else account_purge.status
+            print(
+                f"{account_purge.id} (usuário {account_purge.user_id}): {state}, "
+                f"{account_purge.deleted_rows}/{account_purge.total_rows} linha(s)"
+            )
+    finally:
+        db.close()
+    print(f"{len(purge_ids)} exclusão(ões) em {time.perf_counter() - started:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Tarefas administrativas da FinWise API.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild-spend", help="recalcula os contadores de gasto por categoria e mês")
+    rebuild.add_argument("--user-id", type=int, default=None, help="apenas este usuário (padrão: todos)")
+    rebuild.set_defaults(handler=rebuild_spend)
+
+    archiver = commands.add_parser("archive", help="move as transações antigas para transactions_archive")
+    archiver.add_argument("--user-id", type=int, default=None, help="apenas este usuário (padrão: todos)")
+    archiver.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE, help="linhas por commit")
+    archiver.set_defaults(handler=archive)
+
+    partitioner = commands.add_parser("partitions", help="cria e remove as partições mensais de transactions")
+    partitioner.add_argument(
+        "--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD, help="meses à frente do atual"
+    )
+    partitioner.set_defaults(handler=maintain_partitions)
+
+    purger = commands.add_parser("purge", help="exclui contas em lotes (retoma as exclusões interrompidas)")
+    purger.add_argument("--user-id", type=int, default=None, help="inicia a exclusão deste usuário")
+    purger.add_argument("--batch-size", type=int, default=settings.PURGE_BATCH_SIZE, help="linhas por commit")
+    purger.add_argument(
+        "--stale-minutes", type=int, default=10, help="retoma as em execução sem progresso há este tempo"
+    )
+    purger.set_defaults(handler=purge_accounts)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
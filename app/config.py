@@ -1,12 +1,85 @@
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Opcional: por padrão é derivada de DATABASE_URL (asyncpg/aiosqlite)
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Pool de conexões (por engine e por processo). Some o total de
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW de todos os workers para dimensionar
+    # contra o max_connections do banco.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None
+
+    # Réplicas de leitura (opcional): URLs separadas por vírgula. Os GETs de
+    # transações, usuários e análises vão para elas em rodízio; depois de uma
+    # escrita, as leituras do mesmo usuário ficam no primário por
+    # REPLICA_STICKY_SECONDS (deve cobrir o atraso de replicação)
+    DATABASE_REPLICA_URLS: Optional[str] = None
+    REPLICA_STICKY_SECONDS: float = 5.0
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Hash de senhas (bcrypt) em pool dedicado; alterar BCRYPT_ROUNDS faz
+    # as senhas serem re-hasheadas no próximo login de cada usuário
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Importação de extratos: linhas por bloco (um commit por bloco) e
+    # limite de erros detalhados na resposta
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+    # Lote de escritas (POST /transactions/batch): operações por requisição
+    TRANSACTION_BATCH_MAX_OPERATIONS: int = 500
+
+    # Exportação: linhas buscadas por lote no cursor do servidor
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Instrumentação: métricas em /metrics, header Server-Timing opcional e
+    # log de consultas acima de SLOW_QUERY_MS
+    METRICS_ENABLED: bool = True
+    SERVER_TIMING_ENABLED: bool = False
+    SLOW_QUERY_MS: Optional[int] = 500
+
+    # Cache de usuários autenticados (token -> id, email, is_active)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Transações recorrentes: ocorrências geradas no máximo até hoje +
+    # RECURRENCE_HORIZON_DAYS; índice de ocorrências em cache por usuário
+    RECURRENCE_HORIZON_DAYS: int = 730
+    RECURRENCE_CACHE_SIZE: int = 10000
+    RECURRENCE_CACHE_TTL_SECONDS: int = 3600
+
+    # Arquivamento (`python -m app.cli archive`): transações não recorrentes
+    # de meses inteiros anteriores a hoje - ARCHIVE_AFTER_DAYS vão para
+    # transactions_archive, em lotes de ARCHIVE_BATCH_SIZE. As leituras usam
+    # o mesmo corte para decidir se consultam o arquivo: API e tarefa devem
+    # ter o mesmo valor. PARTITION_MONTHS_AHEAD: partições mensais criadas à
+    # frente (PostgreSQL, `python -m app.cli partitions`)
+    ARCHIVE_AFTER_DAYS: int = 730
+    ARCHIVE_BATCH_SIZE: int = 1000
+    PARTITION_MONTHS_AHEAD: int = 3
+
+    # Exclusão de contas (DELETE /users/me): com mais de PURGE_SYNC_MAX_ROWS
+    # transações, o usuário é desativado na hora e os dados são removidos em
+    # segundo plano, em lotes de PURGE_BATCH_SIZE (um commit por lote)
+    PURGE_SYNC_MAX_ROWS: int = 10000
+    PURGE_BATCH_SIZE: int = 5000
+
+    # Exigido no header X-Internal-Token das rotas /internal e de /metrics;
+    # sem ele, essas rotas respondem 404
+    INTERNAL_TOKEN: Optional[str] = None
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,36 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import user as user_crud
+from ..models.user import User
+from ..schemas.user import UserCreate, UserUpdate
+from ..utils.security import password_hasher
+
+# Versões assíncronas do CRUD de usuários. Leituras simples usam select()
+# nativo; as escritas reaproveitam a implementação síncrona via run_sync,
+# que roda sobre o driver assíncrono sem bloquear o event loop. O hash da
+# senha é calculado antes, no pool do password_hasher.
+
+async def get_user(db: AsyncSession, user_id: int):
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalars().first()
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await db.execute(select(User).order_by(User.id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def create_user(db: AsyncSession, user: UserCreate):
+    hashed_password = await password_hasher.hash_async(user.password)
+    return await db.run_sync(user_crud.create_user, user=user, hashed_password=hashed_password)
+
+async def update_user(db: AsyncSession, user_id: int, user: UserUpdate):
+    hashed_password = None
+    if user.password:
+        hashed_password = await password_hasher.hash_async(user.password)
+    return await db.run_sync(user_crud.update_user, user_id=user_id, user=user, hashed_password=hashed_password)
+
+async def delete_user(db: AsyncSession, user_id: int):
+    return await db.run_sync(user_crud.delete_user, user_id=user_id)
@@ -0,0 +1,82 @@
+from datetime import date
+from sqlalchemy import and_, delete, select, update
+from sqlalchemy.orm import Session
+from ..models.budget import Budget, CategorySpend
+from ..models.category import category_name
+from ..schemas.budget import BudgetCreate, BudgetUpdate
+from ..utils.money import to_cents
+from . import category as category_crud
+
+# Colunas devolvidas pelas escritas, com o nome da categoria
+_RETURNING = (*Budget.__table__.c, category_name(Budget.category_id).label("category"))
+
+def get_user_budgets(db: Session, user_id: int):
+    return db.query(Budget).filter(Budget.user_id == user_id).order_by(Budget.category).all()
+
+def get_user_budget_by_category(db: Session, user_id: int, category: str):
+    return (
+        db.query(Budget)
+        .filter(Budget.user_id == user_id, Budget.category_id == category_crud.category_id_of(user_id, category))
+        .first()
+    )
+
+def _column_values(db: Session, user_id: int, values: dict) -> dict:
+    # Campos do schema -> colunas: amount em centavos, categoria pelo id
+    if "amount" in values:
+        values["amount_cents"] = to_cents(values.pop("amount"))
+    if "category" in values:
+        name = values.pop("category")
+        values["category_id"] = category_crud.get_category_ids(db, user_id, [name])[name]
+    return values
+
+def create_budget(db: Session, budget: BudgetCreate, user_id: int):
+    db_budget = Budget(**_column_values(db, user_id, budget.dict()), user_id=user_id)
+    db.add(db_budget)
+    db.commit()
+    db.refresh(db_budget)
+    return db_budget
+
+def update_user_budget(db: Session, budget_id: int, user_id: int, budget: BudgetUpdate):
+    # UPDATE ... WHERE id = ? AND user_id = ? RETURNING *; None se não existe
+    # ou é de outro usuário
+    update_data = _column_values(db, user_id, budget.dict(exclude_unset=True))
+    stmt = select(*_RETURNING).where(Budget.id == budget_id, Budget.user_id == user_id)
+    if update_data:
+        stmt = (
+            update(Budget)
+            .where(Budget.id == budget_id, Budget.user_id == user_id)
+            .values(**update_data)
+            .returning(*_RETURNING)
+            .execution_options(synchronize_session=False)
+        )
+    row = db.execute(stmt).first()
+    db.commit()
+    return None if row is None else Budget(**row._mapping)
+
+def delete_user_budget(db: Session, budget_id: int, user_id: int):
+    row = db.execute(
+        delete(Budget)
+        .where(Budget.id == budget_id, Budget.user_id == user_id)
+        .returning(*_RETURNING)
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.commit()
+    return None if row is None else Budget(**row._mapping)
+
+def get_budget_spend(db: Session, user_id: int, month: date):
+    # Cada orçamento com o contador do mês na sua moeda: uma leitura pela PK de
+    # category_spend por orçamento, independente do tamanho do histórico
+    return db.execute(
+        select(Budget, CategorySpend.spent_cents, CategorySpend.count)
+        .outerjoin(
+            CategorySpend,
+            and_(
+                CategorySpend.user_id == Budget.user_id,
+                CategorySpend.category_id == Budget.category_id,
+                CategorySpend.currency == Budget.currency,
+                CategorySpend.month == month,
+            ),
+        )
+        .where(Budget.user_id == user_id)
+        .order_by(Budget.category)
+    ).all()
@@ -0,0 +1,53 @@
+from typing import Dict, Iterable
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from ..models.category import Category
+from . import transaction as transaction_crud
+
+def get_user_categories(db: Session, user_id: int):
+    return db.query(Category).filter(Category.user_id == user_id).order_by(Category.name).all()
+
+def get_user_category_by_name(db: Session, user_id: int, name: str):
+    return db.query(Category).filter(Category.user_id == user_id, Category.name == name).first()
+
+def category_id_of(user_id: int, name: str):
+    # Id pelo nome como subconsulta: o filtro vira igualdade no índice
+    # (user_id, category_id, ...), sem comparar strings nas transações
+    return select(Category.id).where(Category.user_id == user_id, Category.name == name).scalar_subquery()
+
+def get_category_ids(db: Session, user_id: int, names: Iterable[str]) -> Dict[str, int]:
+    # nome -> id, criando as categorias usadas pela primeira vez. Uma
+    # leitura para todos os nomes; só os que faltam vão para o INSERT, que
+    # ignora conflito com uma escrita concorrente do mesmo nome
+    names = set(names)
+    if not names:
+        return {}
+    lookup = select(Category.name, Category.id).where(Category.user_id == user_id)
+    ids = dict(db.execute(lookup.where(Category.name.in_(sorted(names)))).all())
+    missing = sorted(names - ids.keys())
+    if missing:
+        upsert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        db.execute(
+            upsert(Category)
+            .values([{"user_id": user_id, "name": name} for name in missing])
+            .on_conflict_do_nothing(index_elements=[Category.user_id, Category.name])
+        )
+        ids.update(db.execute(lookup.where(Category.name.in_(missing))).all())
+    return ids
+
+def rename_user_category(db: Session, category_id: int, user_id: int, name: str):
+    # Uma linha, independente de quantas transações usam a categoria. As
+    # leituras de transações mudam de conteúdo, então a versão do usuário
+    # (ETag, cache de ocorrências) avança junto
+    row = db.execute(
+        update(Category)
+        .where(Category.id == category_id, Category.user_id == user_id)
+        .values(name=name)
+        .returning(*Category.__table__.c)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is not None:
+        transaction_crud.touch_transactions(db, user_id)
+    db.commit()
+    return row
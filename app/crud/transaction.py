@@ -1,34 +1,806 @@
-from sqlalchemy.orm import Session
-from ..models.transaction import Transaction
-from ..schemas.transaction import TransactionCreate, TransactionUpdate
+import hashlib
+import io
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import (
+    Date, Float, and_, case, cast, column, delete, func, insert, literal_column, null, or_, select, table, tuple_,
+    union_all, update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, aliased
+from ..config import settings
+from ..database import mark_primary
+from ..models.budget import CategorySpend
+from ..models.category import Category, category_name
+from ..models.transaction import Transaction, TransactionArchive
+from ..models.user import User
+from ..schemas.transaction import TransactionCreate, TransactionFilters, TransactionUpdate
+from ..utils.dates import naive_utc
+from ..utils.money import DEFAULT_CURRENCY, MINOR_UNITS, average_cents, from_cents, to_cents
+from ..utils.pagination import encode_cursor, encode_rank_cursor
+from ..utils.search import category_terms, fts5_match, search_document, to_tsquery
+from . import category as category_crud
+
+# Colunas copiadas entre a tabela quente e o arquivo, na ordem da tabela
+ARCHIVE_COLUMNS = tuple(column.name for column in Transaction.__table__.c)
+
+# Linhas do arquivo como objetos Transaction (mesmos nomes de colunas)
+ARCHIVED = aliased(Transaction, TransactionArchive.__table__, adapt_on_names=True)
+
+def archive_cutoff(today: Optional[date] = None) -> datetime:
+    # Início do mês mais antigo que nunca é arquivado: archive_user_transactions
+    # só move linhas anteriores ao corte do dia em que roda, que é menor ou
+    # igual ao de qualquer leitura posterior. Intervalos que começam aqui ou
+    # depois não precisam do arquivo
+    day = (today or date.today()) - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    return datetime(day.year, day.month, 1)
+
+def reaches_archive(date_from: Optional[datetime]) -> bool:
+    return date_from is None or naive_utc(date_from) < archive_cutoff()
+
+def with_archive():
+    # Tabela quente + arquivo (UNION ALL) como uma entidade Transaction; os
+    # filtros da consulta externa são levados pelo banco a cada lado
+    transactions = union_all(
+        select(*Transaction.__table__.c),
+        select(*(TransactionArchive.__table__.c[name] for name in ARCHIVE_COLUMNS)),
+    ).subquery("all_transactions")
+    return aliased(Transaction, transactions)
+
+def transaction_source(date_from: Optional[datetime]):
+    # Entidade das leituras que começam em date_from (None: todo o histórico)
+    return with_archive() if reaches_archive(date_from) else Transaction
 
 def get_transaction(db: Session, transaction_id: int):
-    return db.query(Transaction).filter(Transaction.id == transaction_id).first()
+    transaction = db.query(Transaction).filter(Transaction.id == transaction_id).first()
+    if transaction is None:
+        # Caminho frio: a transação pode ter sido arquivada
+        transaction = db.query(ARCHIVED).filter(ARCHIVED.id == transaction_id).first()
+    return transaction
+
+def touch_transactions(db: Session, user_id: int):
+    # Nova versão dos dados de transações do usuário, na mesma transação da
+    # escrita. updated_at é repassado para o onupdate do perfil não disparar.
+    # As próximas leituras do usuário vão para o primário (réplicas atrasadas)
+    mark_primary(user_id)
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            transactions_version=User.transactions_version + 1,
+            transactions_changed_at=func.now(),
+            updated_at=User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+# Tipos que somam no saldo; os demais (expense) subtraem e contam como gasto
+INCOME_TYPES = ("income",)
+
+# Campos que mudam os contadores de gasto (category_spend)
+SPEND_FIELDS = frozenset(("amount", "currency", "type", "category", "date"))
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+def add_spend(deltas: dict, transaction, sign: int = 1):
+    # Acumula em deltas[(id da categoria, moeda, mês)] = (centavos gastos,
+    # quantidade) o efeito de incluir (sign=1) ou remover (sign=-1) uma
+    # transação (objeto do ORM ou linha com as colunas da tabela)
+    if transaction.type in INCOME_TYPES:
+        return
+    key = (transaction.category_id, transaction.currency, month_start(transaction.date))
+    spent, count = deltas.get(key, (0, 0))
+    deltas[key] = (spent + sign * transaction.amount_cents, count + sign)
+
+def apply_spend(db: Session, user_id: int, deltas: dict):
+    # Um único upsert com todos os deltas, na transação da escrita; chaves
+    # em ordem para escritas concorrentes travarem as linhas na mesma ordem
+    rows = [
+        {
+            "user_id": user_id,
+            "category_id": category_id,
+            "currency": currency,
+            "month": month,
+            "spent_cents": spent,
+            "count": count,
+        }
+        for (category_id, currency, month), (spent, count) in sorted(deltas.items())
+        if spent or count
+    ]
+    if not rows:
+        return
+    upsert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = upsert(CategorySpend).values(rows)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[
+                CategorySpend.user_id, CategorySpend.category_id, CategorySpend.currency, CategorySpend.month
+            ],
+            set_={
+                "spent_cents": CategorySpend.spent_cents + stmt.excluded.spent_cents,
+                "count": CategorySpend.count + stmt.excluded.count,
+            },
+        )
+    )
+
+def _month(db: Session, value):
+    if db.get_bind().dialect.name == "sqlite":
+        return func.strftime("%Y-%m-01", value)
+    return cast(func.date_trunc("month", value), Date)
+
+def rebuild_category_spend(db: Session, user_id: int) -> int:
+    # Recalcula os contadores do usuário a partir das transações (inclusive
+    # as arquivadas), para corrigir divergências; o commit fica com quem chama
+    db.execute(delete(CategorySpend).where(CategorySpend.user_id == user_id))
+    source = with_archive()
+    month = _month(db, source.date)
+    totals = (
+        select(
+            source.user_id, source.category_id, source.currency, month, func.sum(source.amount_cents), func.count()
+        )
+        .where(source.user_id == user_id, source.type.not_in(INCOME_TYPES))
+        .group_by(source.user_id, source.category_id, source.currency, month)
+    )
+    result = db.execute(
+        insert(CategorySpend).from_select(
+            ["user_id", "category_id", "currency", "month", "spent_cents", "count"], totals
+        )
+    )
+    return result.rowcount
+
+def get_transactions_version(db: Session, user_id: int):
+    # (transactions_version, transactions_changed_at): leitura pela PK de
+    # users, sem tocar na tabela de transações
+    return db.execute(
+        select(User.transactions_version, User.transactions_changed_at).where(User.id == user_id)
+    ).first()
+
+def apply_filters(query, user_id: int, filters: Optional[TransactionFilters], source=Transaction):
+    # Igualdades antes do intervalo: cada combinação usa um dos índices
+    # compostos (user_id, category_id|type, date), (user_id, amount_cents)
+    # ou (user_id, date, id). A categoria vem pelo nome e é filtrada pelo id
+    if filters is None:
+        return query
+    if filters.category is not None:
+        query = query.filter(source.category_id == category_crud.category_id_of(user_id, filters.category))
+    if filters.type is not None:
+        query = query.filter(source.type == filters.type)
+    if filters.is_recurring is not None:
+        query = query.filter(source.is_recurring.is_(filters.is_recurring))
+    if filters.date_from is not None:
+        query = query.filter(source.date >= filters.date_from)
+    if filters.date_to is not None:
+        query = query.filter(source.date < filters.date_to)
+    if filters.min_amount is not None:
+        query = query.filter(source.amount_cents >= to_cents(filters.min_amount))
+    if filters.max_amount is not None:
+        query = query.filter(source.amount_cents <= to_cents(filters.max_amount))
+    return query
+
+def _date_from(filters: Optional[TransactionFilters]) -> Optional[datetime]:
+    return None if filters is None else filters.date_from
+
+def _list_query(db: Session, source, user_id: int, filters: Optional[TransactionFilters]):
+    return apply_filters(db.query(source).filter(source.user_id == user_id), user_id, filters, source).order_by(
+        source.date.desc(), source.id.desc()
+    )
+
+def _hot_rows_suffice(rows: list, count: int, filters: Optional[TransactionFilters]) -> bool:
+    # As linhas arquivadas são todas anteriores ao corte: se as `count`
+    # primeiras da tabela quente terminam no corte ou depois, nenhuma delas
+    # entraria antes, e a página não precisa do arquivo
+    if not reaches_archive(_date_from(filters)):
+        return True
+    return len(rows) >= count and rows[count - 1].date >= archive_cutoff()
+
+def get_user_transactions(
+    db: Session,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[TransactionFilters] = None,
+):
+    # Tabela quente primeiro; o arquivo só entra em páginas que alcançam o corte
+    rows = _list_query(db, Transaction, user_id, filters).offset(skip).limit(limit).all()
+    if _hot_rows_suffice(rows, limit, filters):
+        return rows
+    return _list_query(db, with_archive(), user_id, filters).offset(skip).limit(limit).all()
+
+def _page_rows(db: Session, source, user_id: int, limit: int, cursor, filters: Optional[TransactionFilters]):
+    query = _list_query(db, source, user_id, filters)
+    if cursor is not None:
+        query = query.filter(tuple_(source.date, source.id) < tuple_(*cursor))
+    return query.limit(limit + 1).all()
+
+def get_user_transactions_page(
+    db: Session,
+    user_id: int,
+    limit: int = 100,
+    cursor: Optional[Tuple[datetime, int]] = None,
+    filters: Optional[TransactionFilters] = None,
+):
+    # Paginação por keyset: cada página é um range scan no índice
+    # (user_id, date, id), com custo independente da profundidade. Páginas
+    # antes do corte do arquivo leem direto a união com ele
+    rows = None
+    if cursor is None or cursor[0] >= archive_cutoff():
+        rows = _page_rows(db, Transaction, user_id, limit, cursor, filters)
+    if rows is None or not _hot_rows_suffice(rows, limit + 1, filters):
+        rows = _page_rows(db, with_archive(), user_id, limit, cursor, filters)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+    return rows, next_cursor
+
+def _category_groups(db: Session, user_id: int, terms: List[str]) -> dict:
+    # Termos cobertos -> ids das categorias do usuário cujo nome os contém.
+    # Os nomes do usuário são poucos e casam aqui, sem ler as categorias de
+    # cada transação
+    groups = {}
+    for category_id, name in db.execute(select(Category.id, Category.name).where(Category.user_id == user_id)):
+        covered = category_terms(name, terms)
+        if covered:
+            groups.setdefault(covered, []).append(category_id)
+    return groups
+
+def _search_condition(source, groups: dict, terms: List[str], description_matches):
+    # Todos os termos no texto descrição + nome da categoria: a descrição
+    # contém todos, ou a categoria cobre parte deles e a descrição o resto.
+    # No banco cada ramo é um índice (textual ou (user_id, category_id, ...))
+    branches = [description_matches(terms)]
+    for covered, ids in sorted(groups.items(), key=lambda item: sorted(item[0])):
+        rest = [term for term in terms if term not in covered]
+        branch = source.category_id.in_(sorted(ids))
+        branches.append(and_(branch, description_matches(rest)) if rest else branch)
+    return or_(*branches)
+
+def _search_matches(db: Session, source, user_id: int, terms: List[str], groups: dict, filters):
+    # Colunas e relevância das correspondências em `source` (tabela quente
+    # ou arquivo, cada uma com seu índice textual)
+    columns = [source.__table__.c[name] for name in ARCHIVE_COLUMNS]
+    if db.get_bind().dialect.name == "sqlite":
+        fts_name = f"{source.__tablename__}_fts"
+        fts = table(fts_name, column("rowid"))
+        fts_table = literal_column(fts_name)
+
+        def description_matches(subset):
+            return source.id.in_(select(fts.c.rowid).where(fts_table.op("MATCH")(fts5_match(subset))))
+
+        # bm25 ("menor = melhor") da descrição contra qualquer um dos
+        # termos; quem casa só pela categoria fica com 0. Subconsulta porque
+        # bm25() só pode ser usada no SELECT/ORDER BY da consulta FTS
+        scores = (
+            select(fts.c.rowid, (-func.bm25(fts_table)).label("score"))
+            .where(fts_table.op("MATCH")(fts5_match(terms, "OR")))
+            .subquery()
+        )
+        rank = func.coalesce(scores.c.score, 0.0).label("rank")
+        stmt = select(*columns, rank).outerjoin(scores, scores.c.rowid == source.id)
+    else:
+        # Na tabela quente, a coluna gerada; no arquivo, o índice de expressão
+        if source is Transaction:
+            search_vector = literal_column("transactions.search_vector")
+        else:
+            search_vector = search_document(source.description)
+        query = to_tsquery(terms)
+
+        def description_matches(subset):
+            return search_vector.op("@@")(to_tsquery(subset))
+
+        # Relevância sobre descrição + nome da categoria; float8: o valor
+        # volta exato no cursor (ts_rank devolve real)
+        document = search_vector.op("||")(search_document(Category.name))
+        rank = cast(func.ts_rank(document, query), Float).label("rank")
+        stmt = select(*columns, rank).join(Category, Category.id == source.category_id)
+    return apply_filters(
+        stmt.where(source.user_id == user_id, _search_condition(source, groups, terms, description_matches)),
+        user_id,
+        filters,
+        source,
+    )
+
+def search_user_transactions(
+    db: Session,
+    user_id: int,
+    terms: List[str],
+    limit: int = 50,
+    cursor: Optional[Tuple[float, int]] = None,
+    filters: Optional[TransactionFilters] = None,
+):
+    # O índice textual seleciona as linhas; a relevância é calculada só
+    # sobre as correspondências do usuário e pagina por keyset (rank, id).
+    # O arquivo entra como um segundo ramo quando o período o alcança
+    groups = _category_groups(db, user_id, terms)
+    sources = [Transaction, TransactionArchive] if reaches_archive(_date_from(filters)) else [Transaction]
+    branches = [_search_matches(db, source, user_id, terms, groups, filters) for source in sources]
+    matches = (union_all(*branches) if len(branches) > 1 else branches[0]).subquery("matches")
+    found = aliased(Transaction, matches)
+    rank, key = matches.c.rank, matches.c.id
+    stmt = select(found, rank)
+    if cursor is not None:
+        stmt = stmt.where(tuple_(rank, key) < tuple_(*cursor))
+    rows = db.execute(stmt.order_by(rank.desc(), key.desc()).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1][0].id)
+    return [row[0] for row in rows], next_cursor
 
-def get_user_transactions(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(Transaction).filter(Transaction.user_id == user_id).offset(skip).limit(limit).all()
+EXPORT_COLUMNS = (
+    "id", "amount", "currency", "description", "type", "date", "is_recurring", "frequency",
+    "category", "end_date", "created_at", "updated_at", "occurrence_of",
+)
+
+def _export_column(name: str, source=Transaction):
+    # occurrence_of só é preenchido nas ocorrências geradas. amount sai como
+    # float8/REAL: a divisão por 100 dá o float mais próximo do decimal
+    if name == "occurrence_of":
+        return null().label(name)
+    if name == "amount":
+        return (cast(source.amount_cents, Float) / MINOR_UNITS).label(name)
+    if name == "category":
+        return category_name(source.category_id).label(name)
+    return getattr(source, name)
+
+def iter_user_transactions(
+    db: Session,
+    user_id: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    batch_size: int = 1000,
+):
+    # Cursor no servidor (yield_per => stream_results): as linhas chegam em
+    # lotes de batch_size, sem materializar o resultado nem criar objetos ORM
+    date_from, date_to = naive_utc(date_from), naive_utc(date_to)
+    source = transaction_source(date_from)
+    stmt = select(*(_export_column(column, source) for column in EXPORT_COLUMNS)).where(
+        source.user_id == user_id
+    )
+    if date_from is not None:
+        stmt = stmt.where(source.date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(source.date < date_to)
+    stmt = stmt.order_by(source.date, source.id).execution_options(yield_per=batch_size)
+    for row in db.execute(stmt):
+        yield row
+
+def _period_bucket(db: Session, period: str, value):
+    # Início do período (YYYY-MM-DD) calculado no próprio banco
+    if db.get_bind().dialect.name == "sqlite":
+        if period == "week":
+            return func.date(value, "weekday 0", "-6 days")
+        fmt = {"day": "%Y-%m-%d", "month": "%Y-%m-01", "year": "%Y-01-01"}[period]
+        return func.strftime(fmt, value)
+    return func.to_char(func.date_trunc(period, value), "YYYY-MM-DD")
+
+def get_transaction_summary(
+    db: Session,
+    user_id: int,
+    period: Optional[str] = None,
+    group_by: Sequence[str] = (),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    # Um único GROUP BY no banco em vez de somar as transações no cliente
+    date_from, date_to = naive_utc(date_from), naive_utc(date_to)
+    source = transaction_source(date_from)
+    keys = []
+    if period:
+        keys.append(_period_bucket(db, period, source.date).label("period"))
+    if "category" in group_by:
+        keys.append(Category.name.label("category"))
+    if "type" in group_by:
+        keys.append(source.type.label("type"))
+    if "currency" in group_by:
+        keys.append(source.currency.label("currency"))
+
+    # Soma inteira dos centavos: total exato; a média é arredondada ao centavo
+    query = db.query(
+        *keys,
+        func.coalesce(func.sum(source.amount_cents), 0).label("total"),
+        func.count(source.id).label("count"),
+    ).filter(source.user_id == user_id)
+    if "category" in group_by:
+        # Agrupa pelo nome via join com o dicionário (uma linha por categoria)
+        query = query.join(Category, Category.id == source.category_id)
+    if date_from is not None:
+        query = query.filter(source.date >= date_from)
+    if date_to is not None:
+        query = query.filter(source.date < date_to)
+    if keys:
+        query = query.group_by(*keys).order_by(*keys)
+    return [
+        dict(row._asdict(), total=from_cents(row.total), average=from_cents(average_cents(row.total, row.count)))
+        for row in query.all()
+    ]
+
+def signed_cents(source=Transaction):
+    return case((source.type.in_(INCOME_TYPES), source.amount_cents), else_=-source.amount_cents)
+
+def _day(db: Session, value):
+    if db.get_bind().dialect.name == "sqlite":
+        return func.date(value)
+    return cast(value, Date)
+
+def get_daily_net_amounts(db: Session, user_id: int, date_to: datetime, currency: str = DEFAULT_CURRENCY):
+    # (dia, soma com sinal em centavos) de todo o histórico na moeda até
+    # date_to (exclusivo), arquivo incluído: uma linha por dia com movimento,
+    # em vez de uma por transação
+    source = with_archive()
+    day = _day(db, source.date).label("day")
+    return db.execute(
+        select(day, func.sum(signed_cents(source)).label("net"))
+        .where(source.user_id == user_id, source.currency == currency, source.date < date_to)
+        .group_by(day)
+    ).all()
+
+def get_recurring_transactions(db: Session, user_id: int, date_to: datetime, currency: str = DEFAULT_CURRENCY):
+    # Lançamentos recorrentes na moeda (índice parcial), com os centavos já
+    # com sinal
+    return db.execute(
+        select(Transaction.date, signed_cents().label("amount_cents"), Transaction.end_date, Transaction.frequency)
+        .where(
+            Transaction.user_id == user_id,
+            Transaction.is_recurring.is_(True),
+            Transaction.currency == currency,
+            Transaction.date < date_to,
+        )
+    ).all()
+
+# Colunas da tabela e o nome da categoria (RETURNING das escritas, origens
+# das ocorrências)
+RETURNING_COLUMNS = (*Transaction.__table__.c, category_name(Transaction.category_id).label("category"))
+ARCHIVED_RETURNING_COLUMNS = (
+    *(TransactionArchive.__table__.c[name] for name in ARCHIVE_COLUMNS),
+    category_name(TransactionArchive.category_id).label("category"),
+)
+
+def get_recurring_sources(db: Session, user_id: int):
+    # Todas as recorrentes do usuário, origem das ocorrências geradas
+    return db.execute(
+        select(*RETURNING_COLUMNS)
+        .where(Transaction.user_id == user_id, Transaction.is_recurring.is_(True))
+        .order_by(Transaction.id)
+    ).all()
 
 def create_transaction(db: Session, transaction: TransactionCreate, user_id: int):
-    db_transaction = Transaction(**transaction.dict(), user_id=user_id)
+    db_transaction = Transaction(**_column_values(db, user_id, transaction.dict()), user_id=user_id)
     db.add(db_transaction)
+    deltas = {}
+    add_spend(deltas, db_transaction)
+    apply_spend(db, user_id, deltas)
+    touch_transactions(db, user_id)
     db.commit()
     db.refresh(db_transaction)
     return db_transaction
 
-def update_transaction(db: Session, transaction_id: int, transaction: TransactionUpdate):
-    db_transaction = db.query(Transaction).filter(Transaction.id == transaction_id).first()
-    if db_transaction:
-        update_data = transaction.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_transaction, key, value)
-        
-        db.commit()
-        db.refresh(db_transaction)
-    return db_transaction
+def transaction_fingerprint(cents: int, date: datetime, description: str) -> str:
+    # Identidade de conteúdo usada para descartar duplicatas na importação
+    raw = f"{cents}|{date.isoformat()}|{description.strip().lower()}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+def get_existing_fingerprints(db: Session, user_id: int, dates: Iterable[datetime], batch_size: int = 500) -> Set[str]:
+    dates = sorted(set(dates))
+    found = set()
+    if not dates:
+        return found
+    source = transaction_source(dates[0])
+    for i in range(0, len(dates), batch_size):
+        rows = (
+            db.query(source.amount_cents, source.date, source.description)
+            .filter(source.user_id == user_id, source.date.in_(dates[i:i + batch_size]))
+            .all()
+        )
+        found.update(transaction_fingerprint(*row) for row in rows)
+    return found
+
+_COPY_COLUMNS = ("amount_cents", "currency", "description", "type", "date", "is_recurring", "frequency", "category_id", "end_date", "user_id")
+
+def _copy_field(value) -> str:
+    # COPY ... (FORMAT csv): vazio sem aspas é NULL, o resto vai entre aspas
+    if value is None:
+        return ""
+    text = value.isoformat(" ") if isinstance(value, datetime) else str(value)
+    return '"' + text.replace('"', '""') + '"'
 
-def delete_transaction(db: Session, transaction_id: int):
-    db_transaction = db.query(Transaction).filter(Transaction.id == transaction_id).first()
-    if db_transaction:
-        db.delete(db_transaction)
+def _copy_transactions(db: Session, rows: List[dict]):
+    buffer = io.BytesIO()
+    for row in rows:
+        buffer.write(",".join(_copy_field(row[column]) for column in _COPY_COLUMNS).encode("utf-8"))
+        buffer.write(b"\n")
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY transactions ({', '.join(_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv, ENCODING 'UTF8')",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+def _column_values(db: Session, user_id: int, values: dict, category_ids: Optional[dict] = None) -> dict:
+    # Campos dos schemas -> colunas: amount (decimal) vira amount_cents e
+    # category (nome) vira category_id, criando a categoria se for nova
+    values = dict(values)
+    if "amount" in values:
+        values["amount_cents"] = to_cents(values.pop("amount"))
+    if "category" in values:
+        name = values.pop("category")
+        if category_ids is None:
+            category_ids = category_crud.get_category_ids(db, user_id, [name])
+        values["category_id"] = category_ids[name]
+    return values
+
+def _transient(row) -> Transaction:
+    # Linha de RETURNING como objeto fora da sessão, com o amount decimal
+    return Transaction(**row._mapping)
+
+def bulk_create_transactions(db: Session, transactions: List[TransactionCreate], user_id: int) -> int:
+    # Inserção em lote sem commit: COPY no PostgreSQL (psycopg2) e
+    # INSERT multi-linha (executemany) nos demais bancos
+    if not transactions:
+        return 0
+    category_ids = category_crud.get_category_ids(db, user_id, {transaction.category for transaction in transactions})
+    rows = [
+        dict(_column_values(db, user_id, transaction.dict(), category_ids), user_id=user_id)
+        for transaction in transactions
+    ]
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+        _copy_transactions(db, rows)
+    else:
+        db.execute(insert(Transaction), rows)
+    deltas = {}
+    for row in rows:
+        add_spend(deltas, SimpleNamespace(**row))
+    apply_spend(db, user_id, deltas)
+    touch_transactions(db, user_id)
+    return len(rows)
+
+def update_user_transaction(db: Session, transaction_id: int, user_id: int, transaction: TransactionUpdate):
+    # UPDATE ... WHERE id = ? AND user_id = ? RETURNING *: verificação de
+    # posse e escrita em um único statement. Devolve None se nenhuma linha
+    # foi afetada (inexistente ou de outro usuário).
+    update_data = transaction.dict(exclude_unset=True)
+    if not update_data:
+        row = db.execute(
+            select(*RETURNING_COLUMNS).where(
+                Transaction.id == transaction_id, Transaction.user_id == user_id
+            )
+        ).first()
+        if row is None:
+            row = db.execute(
+                select(*ARCHIVED_RETURNING_COLUMNS).where(
+                    TransactionArchive.id == transaction_id, TransactionArchive.user_id == user_id
+                )
+            ).first()
+        return None if row is None else _transient(row)
+    deltas, old = {}, None
+    if SPEND_FIELDS & update_data.keys():
+        # Valores anteriores, com a linha travada até o commit (FOR UPDATE é
+        # omitido no SQLite, que já serializa as escritas)
+        old = db.execute(
+            select(
+                Transaction.amount_cents, Transaction.currency, Transaction.type, Transaction.category_id,
+                Transaction.date,
+            )
+            .where(Transaction.id == transaction_id, Transaction.user_id == user_id)
+            .with_for_update()
+        ).first()
+        if old is not None:
+            add_spend(deltas, old, -1)
+    row = db.execute(
+        update(Transaction)
+        .where(Transaction.id == transaction_id, Transaction.user_id == user_id)
+        .values(**_column_values(db, user_id, update_data))
+        .returning(*RETURNING_COLUMNS)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None and restore_archived_transaction(db, transaction_id, user_id):
+        return update_user_transaction(db, transaction_id, user_id, transaction)
+    if row is not None:
+        if old is not None:
+            add_spend(deltas, row)
+            apply_spend(db, user_id, deltas)
+        touch_transactions(db, user_id)
+    db.commit()
+    return None if row is None else _transient(row)
+
+def delete_user_transaction(db: Session, transaction_id: int, user_id: int):
+    # DELETE ... WHERE id = ? AND user_id = ? RETURNING *
+    row = db.execute(
+        delete(Transaction)
+        .where(Transaction.id == transaction_id, Transaction.user_id == user_id)
+        .returning(*RETURNING_COLUMNS)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None and restore_archived_transaction(db, transaction_id, user_id):
+        return delete_user_transaction(db, transaction_id, user_id)
+    if row is not None:
+        deltas = {}
+        add_spend(deltas, row, -1)
+        apply_spend(db, user_id, deltas)
+        touch_transactions(db, user_id)
+    db.commit()
+    return None if row is None else _transient(row)
+
+def _batch_targets(db: Session, user_id: int, operations: list, results: list) -> dict:
+    # id -> linha atual (travada) das alterações e exclusões do lote, em uma
+    # leitura. Caminho frio para o que não estiver na tabela quente: as
+    # arquivadas do usuário voltam para ela e as demais são recusadas
+    targets = {}
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            continue
+        if operation.id in targets:
+            results[index] = {"status": 409, "error": "Transaction already in this batch"}
+        else:
+            targets[operation.id] = index
+    if not targets:
+        return {}
+    ids = sorted(targets)
+    rows = {
+        row.id: row
+        for row in db.execute(
+            select(*Transaction.__table__.c)
+            .where(Transaction.id.in_(ids), Transaction.user_id == user_id)
+            .with_for_update()
+        )
+    }
+    missing = [transaction_id for transaction_id in ids if transaction_id not in rows]
+    if missing:
+        rows.update((row.id, row) for row in restore_archived_transactions(db, missing, user_id))
+        missing = [transaction_id for transaction_id in missing if transaction_id not in rows]
+    if missing:
+        source = with_archive()
+        existing = set(db.execute(select(source.id).where(source.id.in_(missing))).scalars())
+        for transaction_id in missing:
+            index = targets[transaction_id]
+            if transaction_id in existing:
+                error = f"Not authorized to {operations[index].op} this transaction"
+                results[index] = {"status": 403, "error": error}
+            else:
+                results[index] = {"status": 404, "error": "Transaction not found"}
+    return rows
+
+def batch_user_transactions(db: Session, user_id: int, operations: list) -> List[dict]:
+    # Criações, alterações e exclusões (schemas TransactionBatch*) em uma
+    # única transação: um statement por tipo de operação, um upsert dos
+    # contadores de gasto e uma nova versão dos dados. Operações recusadas
+    # (id inexistente, de outro usuário ou repetido) não impedem as demais.
+    # Devolve, na ordem do lote, status e transação ou erro de cada uma
+    results = [None] * len(operations)
+    rows = _batch_targets(db, user_id, operations, results)
+    values = {
+        index: operation.data.dict(exclude_unset=operation.op == "update")
+        for index, operation in enumerate(operations)
+        if results[index] is None and operation.op != "delete"
+    }
+    category_ids = category_crud.get_category_ids(
+        db, user_id, {data["category"] for data in values.values() if "category" in data}
+    )
+    deltas, created, updated, deleted = {}, [], [], []
+    for index, operation in enumerate(operations):
+        if results[index] is not None:
+            continue
+        if operation.op == "create":
+            created.append(dict(_column_values(db, user_id, values[index], category_ids), user_id=user_id))
+            add_spend(deltas, SimpleNamespace(**created[-1]))
+        elif operation.op == "update":
+            changes = _column_values(db, user_id, values[index], category_ids)
+            if changes:
+                row = rows[operation.id]
+                add_spend(deltas, row, -1)
+                add_spend(deltas, SimpleNamespace(**dict(row._mapping, **changes)))
+                updated.append(dict(changes, id=operation.id))
+        else:
+            add_spend(deltas, rows[operation.id], -1)
+            deleted.append(operation.id)
+    transactions = {}
+    if deleted:
+        transactions.update(
+            (row.id, _transient(row))
+            for row in db.execute(
+                delete(Transaction)
+                .where(Transaction.id.in_(deleted), Transaction.user_id == user_id)
+                .returning(*RETURNING_COLUMNS)
+                .execution_options(synchronize_session=False)
+            )
+        )
+    if updated:
+        # UPDATE por chave primária, agrupado pelos campos alterados
+        db.execute(update(Transaction), updated)
+    created_ids = []
+    if created:
+        created_ids = db.execute(
+            insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True), created
+        ).scalars().all()
+    # Linhas finais das alterações (inclusive as sem campos) e criações
+    read_ids = [operations[index].id for index in values if operations[index].op == "update"] + created_ids
+    if read_ids:
+        transactions.update(
+            (row.id, _transient(row))
+            for row in db.execute(select(*RETURNING_COLUMNS).where(Transaction.id.in_(read_ids)))
+        )
+    if deleted or updated or created:
+        apply_spend(db, user_id, deltas)
+        touch_transactions(db, user_id)
+    db.commit()
+    new_ids = iter(created_ids)
+    items = []
+    for index, (operation, result) in enumerate(zip(operations, results)):
+        if result is None:
+            transaction_id = next(new_ids) if operation.op == "create" else operation.id
+            result = {"status": 201 if operation.op == "create" else 200, "transaction": transactions[transaction_id]}
+        else:
+            transaction_id = operation.id
+        items.append(dict(result, index=index, op=operation.op, id=transaction_id))
+    return items
+
+def _move(db: Session, source, target, *conditions) -> int:
+    # INSERT ... SELECT no destino e DELETE na origem, na mesma transação:
+    # as outras conexões veem a linha em uma das tabelas, nunca nas duas
+    columns = [source.__table__.c[name] for name in ARCHIVE_COLUMNS]
+    db.execute(insert(target).from_select(ARCHIVE_COLUMNS, select(*columns).where(*conditions)))
+    return db.execute(delete(source).where(*conditions).execution_options(synchronize_session=False)).rowcount
+
+def archive_user_transactions(db: Session, user_id: int, before: datetime, batch_size: int = 1000) -> int:
+    # Move para o arquivo as transações do usuário anteriores a `before`, em
+    # lotes com commit (locks curtos). As recorrentes ficam: são a origem das
+    # ocorrências (services.recurrence). Os contadores de gasto e a versão
+    # dos dados não mudam, as linhas continuam as mesmas
+    moved = 0
+    while True:
+        # Linhas travadas por uma escrita em andamento ficam para a próxima
+        # execução (SKIP LOCKED; omitido no SQLite)
+        ids = db.execute(
+            select(Transaction.id)
+            .where(Transaction.user_id == user_id, Transaction.date < before, Transaction.is_recurring.is_not(True))
+            .order_by(Transaction.date, Transaction.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not ids:
+            return moved
+        moved += _move(
+            db,
+            Transaction,
+            TransactionArchive,
+            Transaction.user_id == user_id,
+            Transaction.date < before,
+            Transaction.id.in_(ids),
+        )
         db.commit()
-    return db_transaction
\ No newline at end of file
+
+def restore_user_transactions(db: Session, user_id: int, since: datetime) -> int:
+    # Devolve à tabela quente o que o arquivo tiver a partir de `since`
+    # (depois de aumentar ARCHIVE_AFTER_DAYS)
+    moved = _move(
+        db, TransactionArchive, Transaction, TransactionArchive.user_id == user_id, TransactionArchive.date >= since
+    )
+    db.commit()
+    return moved
+
+def restore_archived_transactions(db: Session, transaction_ids: List[int], user_id: int) -> list:
+    # Devolve transações arquivadas do usuário à tabela quente, sem commit,
+    # para serem alteradas ou excluídas como as demais. DELETE ... RETURNING
+    # antes do INSERT: entre escritas concorrentes na mesma linha, só uma a
+    # encontra
+    stmt = delete(TransactionArchive).where(
+        TransactionArchive.id.in_(transaction_ids), TransactionArchive.user_id == user_id
+    )
+    rows = db.execute(
+        stmt.returning(*(TransactionArchive.__table__.c[name] for name in ARCHIVE_COLUMNS))
+        .execution_options(synchronize_session=False)
+    ).all()
+    if rows:
+        db.execute(insert(Transaction), [dict(row._mapping) for row in rows])
+    return rows
+
+def restore_archived_transaction(db: Session, transaction_id: int, user_id: int) -> bool:
+    return bool(restore_archived_transactions(db, [transaction_id], user_id))
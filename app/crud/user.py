@@ -1,7 +1,9 @@
+from typing import Optional
 from sqlalchemy.orm import Session
+from ..database import mark_primary
 from ..models.user import User
 from ..schemas.user import UserCreate, UserUpdate
-from ..utils.security import get_password_hash
+from ..utils.security import get_password_hash, invalidate_principal
 
 def get_user(db: Session, user_id: int):
     return db.query(User).filter(User.id == user_id).first()
@@ -12,8 +14,9 @@ def get_user_by_email(db: Session, email: str):
 def get_users(db: Session, skip: int = 0, limit: int = 100):
     return db.query(User).offset(skip).limit(limit).all()
 
-def create_user(db: Session, user: UserCreate):
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None):
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = User(
         first_name=user.first_name,
         last_name=user.last_name,
@@ -24,14 +27,15 @@ def create_user(db: Session, user: UserCreate):
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    mark_primary(db_user.id)
     return db_user
 
-def update_user(db: Session, user_id: int, user: UserUpdate):
+def update_user(db: Session, user_id: int, user: UserUpdate, hashed_password: Optional[str] = None):
     db_user = db.query(User).filter(User.id == user_id).first()
     if db_user:
         update_data = user.dict(exclude_unset=True)
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(update_data["password"])
+            update_data["hashed_password"] = hashed_password or get_password_hash(update_data["password"])
             del update_data["password"]
         
         for key, value in update_data.items():
@@ -39,12 +43,17 @@ def update_user(db: Session, user_id: int, user: UserUpdate):
             
         db.commit()
         db.refresh(db_user)
+        invalidate_principal(user_id)
+        mark_primary(user_id)
     return db_user
 
 def delete_user(db: Session, user_id: int):
+    # Um DELETE em users; o banco remove transações, categorias e orçamentos
+    # (ON DELETE CASCADE, passive_deletes no model). Contas grandes passam
+    # por services.purge
     db_user = db.query(User).filter(User.id == user_id).first()
     if db_user:
-        db_user.transactions
         db.delete(db_user)
         db.commit()
+        invalidate_principal(user_id)
     return db_user
@@ -1,13 +1,122 @@
-from sqlalchemy import create_engine
+import itertools
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .utils.cache import TTLCache
+from .utils.metrics import install_query_hooks
+from .utils.pooling import TimedAsyncAdaptedQueuePool, TimedQueuePool
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+def _async_database_url(url):
+    # Mesmo banco, driver assíncrono: asyncpg (PostgreSQL) ou aiosqlite (local)
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        return url.set(drivername="postgresql+asyncpg")
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+SQLALCHEMY_ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or _async_database_url(SQLALCHEMY_DATABASE_URL)
+
+def _engine_options(url, poolclass):
+    # SQLite usa o pool padrão do SQLAlchemy; os ajustes valem para servidores
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return {}
+    options = {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_engine_options(SQLALCHEMY_DATABASE_URL, TimedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    **_engine_options(SQLALCHEMY_ASYNC_DATABASE_URL, TimedAsyncAdaptedQueuePool),
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Réplicas de leitura: mesmo schema, só consultas. Engines criadas sem
+# conectar; cada réplica tem pool próprio, síncrono e assíncrono
+REPLICA_URLS = [url.strip() for url in (settings.DATABASE_REPLICA_URLS or "").split(",") if url.strip()]
+replica_engines = [create_engine(url, **_engine_options(url, TimedQueuePool)) for url in REPLICA_URLS]
+async_replica_engines = [
+    create_async_engine(_async_database_url(url), **_engine_options(_async_database_url(url), TimedAsyncAdaptedQueuePool))
+    for url in REPLICA_URLS
+]
+ReplicaSessions = [sessionmaker(autocommit=False, autoflush=False, bind=bind) for bind in replica_engines]
+AsyncReplicaSessions = [
+    async_sessionmaker(bind=bind, autoflush=False, expire_on_commit=False) for bind in async_replica_engines
+]
+
+def _enable_sqlite_foreign_keys(bind):
+    # O SQLite só aplica chaves estrangeiras (e o ON DELETE CASCADE usado na
+    # exclusão de usuários) com o pragma ligado em cada conexão
+    if bind.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(bind, "connect")
+    def _connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+for _engine in [engine, async_engine.sync_engine] + replica_engines + [bind.sync_engine for bind in async_replica_engines]:
+    _enable_sqlite_foreign_keys(_engine)
+
+if settings.METRICS_ENABLED:
+    for _engine in [engine, async_engine.sync_engine] + replica_engines + [bind.sync_engine for bind in async_replica_engines]:
+        install_query_hooks(_engine, slow_query_ms=settings.SLOW_QUERY_MS)
+
+def engines() -> dict:
+    # Todas as engines por rótulo (estatísticas de pool em /internal)
+    labeled = {"sync": engine, "async": async_engine.sync_engine}
+    for number, (bind, async_bind) in enumerate(zip(replica_engines, async_replica_engines)):
+        labeled[f"replica{number}"] = bind
+        labeled[f"replica{number}_async"] = async_bind.sync_engine
+    return labeled
+
+# Usuários que escreveram há menos de REPLICA_STICKY_SECONDS (por processo):
+# suas leituras vão para o primário, para lerem as próprias escritas
+recent_writers = TTLCache(maxsize=100000, ttl=settings.REPLICA_STICKY_SECONDS)
+_replica_counter = itertools.count()
+
+def mark_primary(user_id: int):
+    if REPLICA_URLS:
+        recent_writers.set(user_id, True)
+
+def _replica_index(user_id: int) -> Optional[int]:
+    if not REPLICA_URLS or recent_writers.get(user_id):
+        return None
+    return next(_replica_counter) % len(REPLICA_URLS)
+
+def read_sessionmaker(user_id: int):
+    # Réplica da vez (rodízio) ou o primário
+    index = _replica_index(user_id)
+    return SessionLocal if index is None else ReplicaSessions[index]
+
+def async_read_sessionmaker(user_id: int):
+    index = _replica_index(user_id)
+    return AsyncSessionLocal if index is None else AsyncReplicaSessions[index]
+
 Base = declarative_base()
 
 # Função para obter a sessão do banco de dados
@@ -16,4 +125,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Versão assíncrona, para rotas `async def`: não bloqueia o event loop
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,20 @@
+from fastapi import Depends
+
+from .database import async_read_sessionmaker, read_sessionmaker
+from .schemas import Principal
+from .utils.security import get_current_active_user
+
+# Sessões somente leitura para os GETs: réplica em rodízio, ou o primário
+# quando não há réplicas ou o usuário escreveu há pouco (database.mark_primary).
+# Dependem do usuário autenticado, resolvido uma vez por requisição.
+
+def get_read_db(current_user: Principal = Depends(get_current_active_user)):
+    db = read_sessionmaker(current_user.id)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(current_user: Principal = Depends(get_current_active_user)):
+    async with async_read_sessionmaker(current_user.id)() as db:
+        yield db
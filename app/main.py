@@ -1,13 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .database import engine
-from .models import user, transaction
-from .routers import auth, users, transactions
+from .config import settings
+from .routers import auth, users, transactions, analytics, budgets, categories, internal
+from .utils.metrics import MetricsMiddleware
 
-# Criar as tabelas no banco de dados
-user.Base.metadata.create_all(bind=engine)
-transaction.Base.metadata.create_all(bind=engine)
+# O schema é gerenciado pelas migrações (`alembic upgrade head`), executadas
+# antes do deploy: a inicialização não abre conexão com o banco.
 
 app = FastAPI(title="FinWise API", description="API for managing financial transactions")
 
@@ -20,10 +19,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Métricas por rota; adicionado por último para envolver toda a pilha
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+
 # Incluir routers
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(transactions.router)
+app.include_router(analytics.router)
+app.include_router(budgets.router)
+app.include_router(categories.router)
+app.include_router(internal.router)
+if settings.METRICS_ENABLED:
+    app.include_router(internal.metrics_router)
 
 @app.get("/")
 def read_root():
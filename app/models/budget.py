@@ -0,0 +1,50 @@
+from sqlalchemy import BigInteger, Column, Integer, Float, Date, DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import column_property, relationship
+from ..database import Base
+from .category import category_name
+from ..utils.money import DEFAULT_CURRENCY, from_cents, to_cents
+
+class Budget(Base):
+    __tablename__ = "budgets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    category = column_property(category_name(category_id))
+    # Limite mensal (centavos, na moeda do orçamento: só gastos nessa moeda
+    # contam) e fração do limite que dispara o alerta (0.8 = 80%)
+    amount_cents = Column(BigInteger, nullable=False)
+    currency = Column(String(3), nullable=False, default=DEFAULT_CURRENCY, server_default=DEFAULT_CURRENCY)
+    alert_threshold = Column(Float, nullable=False, default=0.8, server_default="0.8")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    user = relationship("User", back_populates="budgets")
+
+    @property
+    def amount(self):
+        return from_cents(self.amount_cents)
+
+    @amount.setter
+    def amount(self, value):
+        self.amount_cents = to_cents(value)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "category_id", name="uq_budgets_user_category"),
+    )
+
+class CategorySpend(Base):
+    # Gasto acumulado por (usuário, id da categoria, moeda, mês), mantido na mesma
+    # transação das escritas em transactions (crud.transaction). Receitas
+    # não entram. Pode ser recalculado com `python -m app.cli rebuild-spend`.
+    __tablename__ = "category_spend"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    currency = Column(String(3), primary_key=True)
+    month = Column(Date, primary_key=True)  # primeiro dia do mês
+    spent_cents = Column(BigInteger, nullable=False, default=0, server_default="0")
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    user = relationship("User", back_populates="category_spend")
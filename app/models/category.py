@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, select
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from ..database import Base
+
+class Category(Base):
+    # Dicionário de categorias por usuário: transações, orçamentos e
+    # contadores guardam só o id, então renomear é um UPDATE de uma linha
+    __tablename__ = "categories"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship("User", back_populates="categories")
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_categories_user_name"),
+    )
+
+def category_name(category_id):
+    # Nome da categoria como subconsulta escalar (column_property dos
+    # models, RETURNING das escritas)
+    return select(Category.name).where(Category.id == category_id).correlate_except(Category).scalar_subquery()
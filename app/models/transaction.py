@@ -1,16 +1,29 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import DDL, BigInteger, Column, Integer, String, DateTime, ForeignKey, Boolean, Index, event, text
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import column_property, relationship
 from ..database import Base
+from .category import category_name
+from ..utils.money import DEFAULT_CURRENCY, from_cents, to_cents
+from ..utils.search import SEARCH_DOCUMENT_SQL
 
 class Transaction(Base):
+    # No PostgreSQL a tabela é particionada por mês de `date` (migração
+    # 0010, partições mantidas por `python -m app.cli partitions`), com chave
+    # primária (id, date); o ORM continua identificando a linha pelo id
     __tablename__ = "transactions"
 
     id = Column(Integer, primary_key=True, index=True)
-    amount = Column(Float, nullable=False)
+    # Valor em centavos (ver utils.money); `amount` é o decimal equivalente
+    amount_cents = Column(BigInteger, nullable=False)
+    currency = Column(String(3), nullable=False, default=DEFAULT_CURRENCY, server_default=DEFAULT_CURRENCY)
     date = Column(DateTime, nullable=False)
     is_recurring = Column(Boolean, nullable=True)
-    category = Column(String, nullable=False)
+    # Periodicidade das recorrentes: daily, weekly, monthly ou yearly
+    frequency = Column(String(10), nullable=False, default="monthly", server_default="monthly")
+    # Categoria pelo id (tabela categories); `category` é o nome, lido por
+    # subconsulta junto com a linha
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    category = column_property(category_name(category_id))
     end_date = Column(DateTime, nullable=True)
     description = Column(String, nullable=False)
     type = Column(String, nullable=False)  
@@ -20,4 +33,129 @@ class Transaction(Base):
     
     # Relacionamento com o usuário
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
-    user = relationship("User", back_populates="transactions")
\ No newline at end of file
+    user = relationship("User", back_populates="transactions")
+
+    # Linhas armazenadas não são ocorrências geradas (ver services.recurrence)
+    occurrence_of = None
+
+    @property
+    def amount(self):
+        return from_cents(self.amount_cents)
+
+    @amount.setter
+    def amount(self, value):
+        self.amount_cents = to_cents(value)
+
+    __table_args__ = (
+        # Índice da paginação por cursor: (user_id, date DESC, id DESC)
+        Index("ix_transactions_user_date_id", "user_id", "date", "id"),
+        # Filtros da listagem: igualdade + intervalo de datas (já na ordem
+        # date DESC, id DESC da resposta) ou intervalo de valores
+        Index("ix_transactions_user_category_date", "user_id", "category_id", "date", "id"),
+        Index("ix_transactions_user_type_date", "user_id", "type", "date", "id"),
+        Index("ix_transactions_user_amount", "user_id", "amount_cents"),
+        # Parcial: as recorrentes são poucas. O predicado precisa ser o mesmo
+        # que o filtro gera (is_(True)) para o planner usar o índice
+        Index(
+            "ix_transactions_user_recurring_date",
+            "user_id",
+            "date",
+            "id",
+            postgresql_where=text("is_recurring IS true"),
+            sqlite_where=text("is_recurring IS 1"),
+        ),
+        # Ids nunca reaproveitados no SQLite: podem estar no arquivo (0010)
+        {"sqlite_autoincrement": True},
+    )
+
+class TransactionArchive(Base):
+    # Transações antigas movidas pelo arquivamento (crud.transaction.
+    # archive_user_transactions): as mesmas colunas, mantendo o id, mas só o
+    # índice de leitura por período. As leituras de crud.transaction só
+    # incluem esta tabela quando o intervalo pedido começa antes do corte
+    # (archive_cutoff)
+    __tablename__ = "transactions_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    amount_cents = Column(BigInteger, nullable=False)
+    currency = Column(String(3), nullable=False, default=DEFAULT_CURRENCY, server_default=DEFAULT_CURRENCY)
+    date = Column(DateTime, nullable=False)
+    is_recurring = Column(Boolean, nullable=True)
+    frequency = Column(String(10), nullable=False, default="monthly", server_default="monthly")
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    end_date = Column(DateTime, nullable=True)
+    description = Column(String, nullable=False)
+    type = Column(String, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("ix_transactions_archive_user_date_id", "user_id", "date", "id"),
+    )
+
+# Busca textual (GET /transactions/search) na descrição, fora do mapeamento
+# ORM; o nome da categoria é comparado à parte (crud.transaction).
+# PostgreSQL: coluna gerada search_vector com índice GIN (no arquivo, índice
+# GIN de expressão); SQLite: tabelas FTS5 de conteúdo externo, mantidas por
+# triggers. Os mesmos objetos são criados pelas migrações 0004, 0009 e 0010.
+POSTGRESQL_SEARCH_DDL = (
+    "ALTER TABLE transactions ADD COLUMN search_vector tsvector "
+    f"GENERATED ALWAYS AS ({SEARCH_DOCUMENT_SQL}) STORED",
+    "CREATE INDEX ix_transactions_search ON transactions USING gin (search_vector)",
+)
+
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+    "description, content='transactions', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); "
+    "END",
+    "CREATE TRIGGER transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    "END",
+    "CREATE TRIGGER transactions_fts_au AFTER UPDATE OF description ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); "
+    "END",
+)
+
+POSTGRESQL_ARCHIVE_SEARCH_DDL = (
+    f"CREATE INDEX ix_transactions_archive_search ON transactions_archive USING gin (({SEARCH_DOCUMENT_SQL}))",
+)
+
+# Linhas do arquivo não são alteradas: sem trigger de UPDATE
+SQLITE_ARCHIVE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE transactions_archive_fts USING fts5("
+    "description, content='transactions_archive', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER transactions_archive_fts_ai AFTER INSERT ON transactions_archive BEGIN "
+    "INSERT INTO transactions_archive_fts(rowid, description) VALUES (new.id, new.description); "
+    "END",
+    "CREATE TRIGGER transactions_archive_fts_ad AFTER DELETE ON transactions_archive BEGIN "
+    "INSERT INTO transactions_archive_fts(transactions_archive_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    "END",
+)
+
+for _statement in POSTGRESQL_SEARCH_DDL:
+    event.listen(Transaction.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Transaction.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Transaction.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS transactions_fts").execute_if(dialect="sqlite"),
+)
+for _statement in POSTGRESQL_ARCHIVE_SEARCH_DDL:
+    event.listen(TransactionArchive.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_ARCHIVE_SEARCH_DDL:
+    event.listen(TransactionArchive.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    TransactionArchive.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS transactions_archive_fts").execute_if(dialect="sqlite"),
+)
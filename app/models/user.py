@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date 
+from sqlalchemy import BigInteger, Column, Integer, String, Boolean, DateTime, Date 
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -15,4 +15,30 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    # Versão dos dados de transações (ETag/Last-Modified das leituras)
+    transactions_version = Column(Integer, nullable=False, default=0, server_default="0")
+    transactions_changed_at = Column(DateTime(timezone=True), nullable=True)
+    # As tabelas filhas têm ON DELETE CASCADE: excluir o usuário é um DELETE
+    # em users, sem carregar as linhas relacionadas (passive_deletes)
+    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    budgets = relationship("Budget", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    category_spend = relationship(
+        "CategorySpend", back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+class AccountPurge(Base):
+    # Exclusão em segundo plano de uma conta grande (services.purge). Sem
+    # chave estrangeira: o registro continua depois que o usuário é removido
+    __tablename__ = "account_purges"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    # pending, running, done ou failed
+    status = Column(String(10), nullable=False, default="pending", server_default="pending")
+    total_rows = Column(BigInteger, nullable=False, default=0, server_default="0")
+    deleted_rows = Column(BigInteger, nullable=False, default=0, server_default="0")
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
\ No newline at end of file
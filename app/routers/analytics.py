@@ -0,0 +1,118 @@
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from ..schemas import BalanceSeries, Principal
+from ..dependencies import get_read_db
+from ..services import balance
+from ..utils.money import DEFAULT_CURRENCY
+from ..utils.security import get_current_active_user
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+# Limite da janela pedida, para manter a resposta (um valor por dia) pequena
+MAX_WINDOW_DAYS = 3660
+
+@router.get("/balance", response_model=BalanceSeries, summary="Saldo diário",
+    description="Este endpoint retorna o saldo acumulado do usuário autenticado dia a dia, no intervalo de `date_from` (inclusivo) a `date_to` (exclusivo); por padrão, os últimos 90 dias até hoje. Receitas (`income`) somam e as demais transações subtraem; `opening_balance` é o saldo de todo o histórico anterior a `date_from`. Com `include_recurring=true` (padrão) as transações recorrentes são projetadas pela sua frequência (`frequency`) até `end_date`, então dias posteriores a `as_of` mostram o saldo previsto. A série considera só as transações na moeda `currency` (padrão `BRL`), sem conversão entre moedas.",
+    responses={
+        200: {
+            "description": "Série diária de saldo",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "date_from": "2025-04-27",
+                        "date_to": "2025-04-30",
+                        "as_of": "2025-04-29",
+                        "currency": "BRL",
+                        "opening_balance": 1520.35,
+                        "dates": ["2025-04-27", "2025-04-28", "2025-04-29"],
+                        "net": [0.0, -100.0, 3000.0],
+                        "balance": [1520.35, 1420.35, 4420.35]
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "Intervalo inválido",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "date_to must be after date_from"
+                    }
+                }
+            }
+        },
+        401: {
+            "description": "Usuário não autenticado",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Not authenticated"
+                    }
+                }
+            }
+        }
+    })
+def read_balance(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    include_recurring: bool = True,
+    currency: str = Query(DEFAULT_CURRENCY, pattern="^[A-Z]{3}$"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    if date_to is None:
+        date_to = date.today() + timedelta(days=1)
+    if date_from is None:
+        date_from = date_to - timedelta(days=90)
+    if date_to <= date_from:
+        raise HTTPException(status_code=400, detail="date_to must be after date_from")
+    if (date_to - date_from).days > MAX_WINDOW_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range must not exceed {MAX_WINDOW_DAYS} days")
+    return balance.balance_series(
+        db, current_user.id, date_from, date_to, include_recurring=include_recurring, currency=currency
+    )
+
+@router.get("/forecast", response_model=BalanceSeries, summary="Previsão de fluxo de caixa",
+    description="Este endpoint projeta o saldo do usuário autenticado para os próximos `days` dias (padrão 90, máximo 730), a partir de hoje. Parte do saldo atual e soma as transações já lançadas com data futura e as ocorrências das transações recorrentes, até `end_date` de cada uma ou o fim do horizonte. Como em `GET /analytics/balance`, a série é da moeda `currency` (padrão `BRL`).",
+    responses={
+        200: {
+            "description": "Saldo previsto por dia",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "date_from": "2025-04-29",
+                        "date_to": "2025-05-02",
+                        "as_of": "2025-04-29",
+                        "currency": "BRL",
+                        "opening_balance": 1420.35,
+                        "dates": ["2025-04-29", "2025-04-30", "2025-05-01"],
+                        "net": [3000.0, 0.0, -1200.0],
+                        "balance": [4420.35, 4420.35, 3220.35]
+                    }
+                }
+            }
+        },
+        401: {
+            "description": "Usuário não autenticado",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Not authenticated"
+                    }
+                }
+            }
+        }
+    })
+def read_forecast(
+    days: int = Query(90, ge=1, le=730),
+    currency: str = Query(DEFAULT_CURRENCY, pattern="^[A-Z]{3}$"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    today = date.today()
+    return balance.balance_series(
+        db, current_user.id, today, today + timedelta(days=days), today=today, currency=currency
+    )
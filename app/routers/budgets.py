@@ -0,0 +1,236 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from ..crud import budget as budget_crud
+from ..schemas import Budget, BudgetCreate, BudgetUpdate, BudgetStatus, Principal
+from ..database import get_db
+from ..services import budget as budget_service
+from ..utils.security import get_current_active_user
+
+router = APIRouter(prefix="/budgets", tags=["Budgets"])
+
+@router.get("/", response_model=List[Budget], summary="Listar orçamentos",
+    description="Este endpoint retorna os orçamentos mensais por categoria do usuário autenticado, em ordem de categoria.",
+    responses={
+        200: {
+            "description": "Lista de orçamentos",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "id": 1,
+                            "category": "Alimentação",
+                            "amount": 1500.00,
+                            "currency": "BRL",
+                            "alert_threshold": 0.8,
+                            "user_id": 1,
+                            "created_at": "2025-04-01T12:00:00",
+                            "updated_at": None
+                        }
+                    ]
+                }
+            }
+        },
+        401: {
+            "description": "Usuário não autenticado",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Not authenticated"
+                    }
+                }
+            }
+        }
+    })
+def read_budgets(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    return budget_crud.get_user_budgets(db, user_id=current_user.id)
+
+@router.post("/", response_model=Budget, summary="Criar orçamento",
+    description="Este endpoint cria um orçamento mensal para uma categoria do usuário autenticado. `amount` é o limite do mês, na moeda `currency` (padrão `BRL`; só transações nessa moeda contam), e `alert_threshold` a fração do limite (entre 0 e 1, padrão 0.8) a partir da qual `GET /budgets/status` indica alerta. Cada categoria tem no máximo um orçamento.",
+    responses={
+        200: {
+            "description": "Orçamento criado com sucesso",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "id": 1,
+                        "category": "Alimentação",
+                        "amount": 1500.00,
+                        "currency": "BRL",
+                        "alert_threshold": 0.8,
+                        "user_id": 1,
+                        "created_at": "2025-04-01T12:00:00",
+                        "updated_at": None
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "Já existe orçamento para a categoria",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Budget already exists for this category"
+                    }
+                }
+            }
+        }
+    })
+def create_budget(
+    budget: BudgetCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    if budget_crud.get_user_budget_by_category(db, user_id=current_user.id, category=budget.category):
+        raise HTTPException(status_code=400, detail="Budget already exists for this category")
+    return budget_crud.create_budget(db, budget=budget, user_id=current_user.id)
+
+@router.get("/status", response_model=BudgetStatus, summary="Situação dos orçamentos no mês",
+    description="Este endpoint retorna, para cada orçamento do usuário autenticado, o gasto do mês (`month`, qualquer data do mês; padrão: mês atual), o saldo restante e a fração consumida (`ratio`). `alert` indica que `ratio` atingiu `alert_threshold` e `exceeded` que o limite foi ultrapassado. O gasto vem de contadores mantidos a cada escrita, sem somar as transações, então o custo não depende do tamanho do histórico. Receitas (`income`) e transações em outra moeda que não a do orçamento não contam. Com `include_recurring=true` (padrão) as ocorrências das transações recorrentes no mês também entram.",
+    responses={
+        200: {
+            "description": "Situação dos orçamentos",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "month": "2025-04-01",
+                        "items": [
+                            {
+                                "budget_id": 1,
+                                "category": "Alimentação",
+                                "amount": 1500.00,
+                                "currency": "BRL",
+                                "alert_threshold": 0.8,
+                                "spent": 1250.40,
+                                "count": 18,
+                                "remaining": 249.60,
+                                "ratio": 0.8336,
+                                "alert": True,
+                                "exceeded": False
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        401: {
+            "description": "Usuário não autenticado",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Not authenticated"
+                    }
+                }
+            }
+        }
+    })
+def read_budget_status(
+    month: Optional[date] = None,
+    include_recurring: bool = True,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    return budget_service.budget_status(
+        db, current_user.id, month=month, include_recurring=include_recurring
+    )
+
+@router.put("/{budget_id}", response_model=Budget, summary="Atualizar orçamento",
+    description="Este endpoint atualiza o limite, a moeda, o limiar de alerta ou a categoria de um orçamento do usuário autenticado.",
+    responses={
+        200: {
+            "description": "Orçamento atualizado com sucesso",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "id": 1,
+                        "category": "Alimentação",
+                        "amount": 1800.00,
+                        "alert_threshold": 0.9,
+                        "user_id": 1,
+                        "created_at": "2025-04-01T12:00:00",
+                        "updated_at": "2025-04-15T12:00:00"
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "Já existe orçamento para a categoria",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Budget already exists for this category"
+                    }
+                }
+            }
+        },
+        404: {
+            "description": "Orçamento não encontrado",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Budget not found"
+                    }
+                }
+            }
+        }
+    })
+def update_budget(
+    budget_id: int,
+    budget: BudgetUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    if budget.category is not None:
+        existing = budget_crud.get_user_budget_by_category(db, user_id=current_user.id, category=budget.category)
+        if existing is not None and existing.id != budget_id:
+            raise HTTPException(status_code=400, detail="Budget already exists for this category")
+    db_budget = budget_crud.update_user_budget(db, budget_id=budget_id, user_id=current_user.id, budget=budget)
+    if db_budget is None:
+        raise HTTPException(status_code=404, detail="Budget not found")
+    return db_budget
+
+@router.delete("/{budget_id}", response_model=Budget, summary="Excluir orçamento",
+    description="Este endpoint exclui um orçamento do usuário autenticado. Os contadores de gasto da categoria são mantidos.",
+    responses={
+        200: {
+            "description": "Orçamento excluído com sucesso",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "id": 1,
+                        "category": "Alimentação",
+                        "amount": 1500.00,
+                        "currency": "BRL",
+                        "alert_threshold": 0.8,
+                        "user_id": 1,
+                        "created_at": "2025-04-01T12:00:00",
+                        "updated_at": None
+                    }
+                }
+            }
+        },
+        404: {
+            "description": "Orçamento não encontrado",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Budget not found"
+                    }
+                }
+            }
+        }
+    })
+def delete_budget(
+    budget_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    db_budget = budget_crud.delete_user_budget(db, budget_id=budget_id, user_id=current_user.id)
+    if db_budget is None:
+        raise HTTPException(status_code=404, detail="Budget not found")
+    return db_budget
@@ -0,0 +1,106 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import List
+
+from ..crud import category as category_crud
+from ..schemas import Category, CategoryUpdate, Principal
+from ..database import get_db
+from ..dependencies import get_read_db
+from ..utils.security import get_current_active_user
+
+router = APIRouter(prefix="/categories", tags=["Categories"])
+
+@router.get("/", response_model=List[Category], summary="Listar categorias",
+    description="Este endpoint retorna as categorias do usuário autenticado, em ordem alfabética. As categorias são criadas automaticamente no primeiro uso do nome em uma transação ou orçamento.",
+    responses={
+        200: {
+            "description": "Lista de categorias",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "id": 1,
+                            "user_id": 1,
+                            "name": "Alimentação",
+                            "created_at": "2025-04-01T12:00:00"
+                        }
+                    ]
+                }
+            }
+        },
+        401: {
+            "description": "Usuário não autenticado",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Not authenticated"
+                    }
+                }
+            }
+        }
+    })
+def read_categories(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    return category_crud.get_user_categories(db, user_id=current_user.id)
+
+@router.put("/{category_id}", response_model=Category, summary="Renomear categoria",
+    description="Este endpoint renomeia uma categoria do usuário autenticado. Transações e orçamentos guardam apenas o id da categoria, então o novo nome vale imediatamente para todos eles, sem reescrevê-los.",
+    responses={
+        200: {
+            "description": "Categoria renomeada com sucesso",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "id": 1,
+                        "user_id": 1,
+                        "name": "Mercado",
+                        "created_at": "2025-04-01T12:00:00"
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "Já existe categoria com o nome",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Category already exists"
+                    }
+                }
+            }
+        },
+        404: {
+            "description": "Categoria não encontrada",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Category not found"
+                    }
+                }
+            }
+        }
+    })
+def rename_category(
+    category_id: int,
+    category: CategoryUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    existing = category_crud.get_user_category_by_name(db, user_id=current_user.id, name=category.name)
+    if existing is not None and existing.id != category_id:
+        raise HTTPException(status_code=400, detail="Category already exists")
+    try:
+        db_category = category_crud.rename_user_category(
+            db, category_id=category_id, user_id=current_user.id, name=category.name
+        )
+    except IntegrityError:
+        # Renomeação concorrente para o mesmo nome: a verificação acima não
+        # a vê, a restrição única (user_id, name) barra
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Category already exists")
+    if db_category is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+    return db_category
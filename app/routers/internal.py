@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from ..database import engines
+from ..utils.metrics import register_collector, render_latest
+from ..utils.pooling import pool_status
+from ..utils.security import password_hasher, principal_cache, verify_internal_token
+
+# Rotas operacionais (fora da documentação pública)
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    include_in_schema=False,
+    dependencies=[Depends(verify_internal_token)],
+)
+
+# /metrics fica na raiz, onde o Prometheus procura por padrão
+metrics_router = APIRouter(
+    tags=["Internal"],
+    include_in_schema=False,
+    dependencies=[Depends(verify_internal_token)],
+)
+
+@router.get("/cache")
+def read_cache_stats():
+    return {"principal_cache": principal_cache.stats()}
+
+@router.get("/password-hasher")
+def read_password_hasher_stats():
+    return password_hasher.stats()
+
+@router.get("/pool")
+def read_pool_stats():
+    return {label: pool_status(bind) for label, bind in engines().items()}
+
+@register_collector
+def _collect_runtime_stats():
+    pools = {label: pool_status(bind) for label, bind in engines().items()}
+    for key, name, documentation in (
+        ("checked_out", "db_pool_checked_out", "Connections currently checked out."),
+        ("overflow", "db_pool_overflow", "Connections opened beyond pool_size."),
+        ("size", "db_pool_size", "Configured pool size."),
+    ):
+        samples = [({"engine": label}, status[key]) for label, status in pools.items() if key in status]
+        yield name, "gauge", documentation, samples
+    for key, name, documentation in (
+        ("checkouts", "db_pool_checkouts_total", "Successful pool checkouts."),
+        ("timeouts", "db_pool_checkout_timeouts_total", "Pool checkouts that timed out."),
+        ("wait_seconds_total", "db_pool_wait_seconds_total", "Time spent waiting for a pooled connection."),
+    ):
+        samples = [({"engine": label}, status[key]) for label, status in pools.items() if key in status]
+        yield name, "counter", documentation, samples
+
+    cache = principal_cache.stats()
+    yield "principal_cache_hits_total", "counter", "Principal cache hits.", [({}, cache["hits"])]
+    yield "principal_cache_misses_total", "counter", "Principal cache misses.", [({}, cache["misses"])]
+    yield "principal_cache_size", "gauge", "Entries in the principal cache.", [({}, cache["size"])]
+
+    hasher = password_hasher.stats()
+    yield "password_hash_queued", "gauge", "Password hash operations waiting for a worker.", [({}, hasher["queued"])]
+    yield "password_hash_running", "gauge", "Password hash operations in progress.", [({}, hasher["running"])]
+    yield "password_hash_rejected_total", "counter", "Password hash operations rejected by the queue limit.", [({}, hasher["rejected"])]
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    return PlainTextResponse(render_latest(), media_type="text/plain; version=0.0.4")
@@ -1,16 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+import codecs
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 
 from ..crud import transaction as transaction_crud
-from ..schemas import Transaction, TransactionCreate, TransactionUpdate, User
-from ..database import get_db
+from ..schemas import Transaction, TransactionCreate, TransactionUpdate, TransactionFilters, TransactionPage, TransactionSummary, TransactionImportResult, TransactionBatch, TransactionBatchResult, Principal
+from ..config import settings
+from ..database import get_db, read_sessionmaker
+from ..dependencies import get_read_db
+from ..services import exporter, importer, recurrence
+from ..utils.conditional import transaction_validators
+from ..utils.pagination import decode_cursor, decode_rank_cursor
+from ..utils.search import search_terms
 from ..utils.security import get_current_active_user
+from ..utils.serialization import ORJSONResponse, transaction_list_response, transaction_page_response, transaction_to_dict
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
+def _raise_not_found_or_forbidden(db: Session, transaction_id: int, action: str):
+    # Caminho frio: só é consultado quando a escrita não afetou nenhuma linha
+    if transaction_crud.get_transaction(db, transaction_id=transaction_id) is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    raise HTTPException(status_code=403, detail=f"Not authorized to {action} this transaction")
+
 @router.get("/", response_model=List[Transaction], summary="Listar transações do usuário",
-    description="Este endpoint retorna uma lista de transações do usuário autenticado. Você pode paginar os resultados fornecendo parâmetros de `skip` e `limit`.",
+    description="Este endpoint retorna uma lista de transações do usuário autenticado, ordenadas por data (mais recentes primeiro). Você pode paginar os resultados fornecendo parâmetros de `skip` e `limit` e filtrar por `date_from` (inclusivo), `date_to` (exclusivo), `category`, `type`, `min_amount`, `max_amount` e `is_recurring`; para históricos grandes prefira `GET /transactions/page`, que pagina por cursor. As respostas trazem `ETag` e, quando a última alteração tem pelo menos um segundo, `Last-Modified`; reenvie-os em `If-None-Match`/`If-Modified-Since` para receber `304` quando nada mudou. Com `format=columnar` a resposta traz um array por campo (`{\"id\": [...], \"amount\": [...], ...}`), sem repetir as chaves em cada transação. Com `expand_recurring=true` as transações recorrentes aparecem também nas ocorrências seguintes, conforme `frequency` e até `end_date`, identificadas por `occurrence_of` (id da transação de origem); sem `date_to`, até o fim do dia de hoje.",
     responses={
         200: {
             "description": "Lista de transações",
@@ -20,20 +36,26 @@ router = APIRouter(prefix="/transactions", tags=["Transactions"])
                         {
                             "id": 1,
                             "amount": 100.00,
+                            "currency": "BRL",
                             "description": "Compra no supermercado",
                             "type": "expense",
                             "date": "2025-04-28T12:00:00",
                             "is_recurring": False,
+                            "frequency": "monthly",
                             "category": "Alimentação",
                             "end_date": None,
                             "user_id": 1,
                             "created_at": "2025-04-28T12:00:00",
-                            "updated_at": None
+                            "updated_at": None,
+                            "occurrence_of": None
                         }
                     ]
                 }
             }
         },
+        304: {
+            "description": "Sem alterações desde a versão informada em `If-None-Match` ou `If-Modified-Since`"
+        },
         401: {
             "description": "Usuário não autenticado",
             "content": {
@@ -46,16 +68,259 @@ router = APIRouter(prefix="/transactions", tags=["Transactions"])
         }
     })
 def read_transactions(
+    request: Request,
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    filters: TransactionFilters = Depends(),
+    expand_recurring: bool = False,
+    response_format: Literal["json", "columnar"] = Query("json", alias="format"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    version = transaction_crud.get_transactions_version(db, current_user.id)
+    validators = transaction_validators(
+        request, current_user.id, version, day=date.today() if expand_recurring else None
+    )
+    if validators.matches(request):
+        return validators.not_modified()
+    if expand_recurring:
+        occurrences = recurrence.get_occurrences(
+            db, current_user.id, version.transactions_version, filters.date_from, filters.date_to, filters
+        )
+        transactions = recurrence.merge_offset_page(
+            lambda offset, count: transaction_crud.get_user_transactions(
+                db, user_id=current_user.id, skip=offset, limit=count, filters=filters
+            ),
+            occurrences,
+            skip,
+            limit,
+        )
+    else:
+        transactions = transaction_crud.get_user_transactions(
+            db, user_id=current_user.id, skip=skip, limit=limit, filters=filters
+        )
+    return validators.apply(transaction_list_response(transactions, response_format))
+
+@router.get("/page", response_model=TransactionPage, summary="Listar transações com paginação por cursor",
+    description="Este endpoint retorna as transações do usuário autenticado ordenadas por data (mais recentes primeiro). Envie o `next_cursor` da resposta anterior no parâmetro `cursor` para obter a próxima página. O custo de cada página é constante, independente da profundidade. Aceita os mesmos filtros, o `expand_recurring`, o `format=columnar` e o GET condicional (`ETag`/`304`) de `GET /transactions/`; mantenha os filtros iguais ao seguir o cursor.",
+    responses={
+        200: {
+            "description": "Página de transações",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "items": [
+                            {
+                                "id": 1,
+                                "amount": 100.00,
+                                "currency": "BRL",
+                                "description": "Compra no supermercado",
+                                "type": "expense",
+                                "date": "2025-04-28T12:00:00",
+                                "is_recurring": False,
+                                "frequency": "monthly",
+                                "category": "Alimentação",
+                                "end_date": None,
+                                "user_id": 1,
+                                "created_at": "2025-04-28T12:00:00",
+                                "updated_at": None,
+                                "occurrence_of": None
+                            }
+                        ],
+                        "next_cursor": "eyJkIjoiMjAyNS0wNC0yOFQxMjowMDowMCIsImkiOjF9"
+                    }
+                }
+            }
+        },
+        304: {
+            "description": "Sem alterações desde a versão informada em `If-None-Match` ou `If-Modified-Since`"
+        },
+        400: {
+            "description": "Cursor inválido",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Invalid cursor"
+                    }
+                }
+            }
+        }
+    })
+def read_transactions_page(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    filters: TransactionFilters = Depends(),
+    expand_recurring: bool = False,
+    response_format: Literal["json", "columnar"] = Query("json", alias="format"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    version = transaction_crud.get_transactions_version(db, current_user.id)
+    validators = transaction_validators(
+        request, current_user.id, version, day=date.today() if expand_recurring else None
+    )
+    if validators.matches(request):
+        return validators.not_modified()
+    items, next_cursor = transaction_crud.get_user_transactions_page(
+        db, user_id=current_user.id, limit=limit, cursor=position, filters=filters
+    )
+    if expand_recurring:
+        occurrences = recurrence.get_occurrences(
+            db, current_user.id, version.transactions_version, filters.date_from, filters.date_to, filters
+        )
+        items, next_cursor = recurrence.merge_keyset_page(items, next_cursor, occurrences, limit, position)
+    return validators.apply(transaction_page_response(items, next_cursor, response_format))
+
+@router.get("/search", response_model=TransactionPage, summary="Buscar transações por texto",
+    description="Este endpoint busca as transações do usuário autenticado pela descrição e pela categoria. A busca ignora acentos e maiúsculas, considera cada termo como prefixo (`merc` encontra \"Mercado\") e exige todos os termos. Os resultados vêm ordenados por relevância; envie o `next_cursor` no parâmetro `cursor` para obter a próxima página. Aceita os mesmos filtros e o `format=columnar` de `GET /transactions/`.",
+    responses={
+        200: {
+            "description": "Transações encontradas",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "items": [
+                            {
+                                "id": 1,
+                                "amount": 100.00,
+                                "currency": "BRL",
+                                "description": "Mercado Extra",
+                                "type": "expense",
+                                "date": "2025-04-28T12:00:00",
+                                "is_recurring": False,
+                                "frequency": "monthly",
+                                "category": "Alimentação",
+                                "end_date": None,
+                                "user_id": 1,
+                                "created_at": "2025-04-28T12:00:00",
+                                "updated_at": None,
+                                "occurrence_of": None
+                            }
+                        ],
+                        "next_cursor": "eyJyIjowLjA2MDc5MjcsImkiOjF9"
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "Busca ou cursor inválido",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Search query must contain letters or digits"
+                    }
+                }
+            }
+        }
+    })
+def search_transactions(
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    filters: TransactionFilters = Depends(),
+    response_format: Literal["json", "columnar"] = Query("json", alias="format"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    transactions = transaction_crud.get_user_transactions(db, user_id=current_user.id, skip=skip, limit=limit)
-    return transactions
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query must contain letters or digits")
+    try:
+        position = decode_rank_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    items, next_cursor = transaction_crud.search_user_transactions(
+        db, user_id=current_user.id, terms=terms, limit=limit, cursor=position, filters=filters
+    )
+    return transaction_page_response(items, next_cursor, response_format)
+
+@router.get("/summary", response_model=TransactionSummary, summary="Resumo das transações",
+    description="Este endpoint retorna totais, quantidades e médias das transações do usuário autenticado, calculados no banco de dados. Use `period` (`day`, `week`, `month` ou `year`) para agrupar por período e `group_by` (`category`, `type`, `currency`) para agrupar por categoria, tipo e/ou moeda. Os totais são somas exatas dos valores em centavos; a média é arredondada ao centavo. O intervalo considera `date_from` (inclusivo) e `date_to` (exclusivo). Com `expand_recurring=true` as ocorrências das transações recorrentes no intervalo (sem `date_to`, até o fim do dia de hoje) entram nos totais. Suporta GET condicional (`ETag`/`If-None-Match`, `304`).",
+    responses={
+        200: {
+            "description": "Resumo das transações",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "period": "month",
+                        "group_by": ["category", "type"],
+                        "date_from": "2025-01-01T00:00:00",
+                        "date_to": "2025-05-01T00:00:00",
+                        "items": [
+                            {
+                                "period": "2025-04-01",
+                                "category": "Alimentação",
+                                "type": "expense",
+                                "currency": None,
+                                "total": 1250.40,
+                                "count": 18,
+                                "average": 69.47
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        304: {
+            "description": "Sem alterações desde a versão informada em `If-None-Match` ou `If-Modified-Since`"
+        },
+        401: {
+            "description": "Usuário não autenticado",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Not authenticated"
+                    }
+                }
+            }
+        }
+    })
+def read_transactions_summary(
+    request: Request,
+    response: Response,
+    period: Optional[Literal["day", "week", "month", "year"]] = None,
+    group_by: List[Literal["category", "type", "currency"]] = Query([]),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    expand_recurring: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    version = transaction_crud.get_transactions_version(db, current_user.id)
+    validators = transaction_validators(
+        request, current_user.id, version, day=date.today() if expand_recurring else None
+    )
+    if validators.matches(request):
+        return validators.not_modified()
+    response.headers.update(validators.headers)
+    items = transaction_crud.get_transaction_summary(
+        db,
+        user_id=current_user.id,
+        period=period,
+        group_by=group_by,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    if expand_recurring:
+        occurrences = recurrence.get_occurrences(
+            db, current_user.id, version.transactions_version, date_from, date_to
+        )
+        items = recurrence.merge_summary(items, occurrences, period, group_by)
+    return {
+        "period": period,
+        "group_by": group_by,
+        "date_from": date_from,
+        "date_to": date_to,
+        "items": items,
+    }
 
 @router.post("/", response_model=Transaction, summary="Criar nova transação",
-    description="Este endpoint cria uma nova transação para o usuário autenticado. O usuário é automaticamente associado à transação.",
+    description="Este endpoint cria uma nova transação para o usuário autenticado. O usuário é automaticamente associado à transação. `amount` aceita no máximo duas casas decimais e é gravado de forma exata, em centavos; `currency` é o código ISO 4217 da moeda (padrão `BRL`).",
     responses={
         201: {
             "description": "Transação criada com sucesso",
@@ -64,15 +329,18 @@ def read_transactions(
                     "example": {
                         "id": 1,
                         "amount": 100.00,
+                        "currency": "BRL",
                         "description": "Compra no supermercado",
                         "type": "expense",
                         "date": "2025-04-28T12:00:00",
                         "is_recurring": False,
+                        "frequency": "monthly",
                         "category": "Alimentação",
                         "end_date": None,
                         "user_id": 1,
                         "created_at": "2025-04-28T12:00:00",
-                        "updated_at": None
+                        "updated_at": None,
+                        "occurrence_of": None
                     }
                 }
             }
@@ -91,12 +359,196 @@ def read_transactions(
 def create_transaction(
     transaction: TransactionCreate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     return transaction_crud.create_transaction(db=db, transaction=transaction, user_id=current_user.id)
 
+@router.post("/import", response_model=TransactionImportResult, summary="Importar transações em lote",
+    description="Este endpoint importa um extrato (CSV, NDJSON ou OFX) para o usuário autenticado. O arquivo é processado em streaming, validado e gravado em blocos de `chunk_size` linhas, com um commit por bloco. Linhas com mesmo valor, data e descrição de uma transação já existente são ignoradas como duplicatas. O formato é detectado pela extensão do arquivo ou informado em `format`. Arquivos CSV usam como cabeçalho os campos da transação; no OFX a categoria é `default_category`.",
+    responses={
+        200: {
+            "description": "Resultado da importação",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "format": "csv",
+                        "processed": 3,
+                        "inserted": 1,
+                        "duplicates": 1,
+                        "failed": 1,
+                        "errors": [
+                            {
+                                "row": 4,
+                                "error": "amount: Input should be a valid number, unable to parse string as a number"
+                            }
+                        ],
+                        "errors_truncated": False
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "Formato de arquivo não suportado",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Unsupported file format"
+                    }
+                }
+            }
+        }
+    })
+def import_transactions(
+    file: UploadFile = File(...),
+    file_format: Optional[Literal["csv", "ndjson", "ofx"]] = Query(None, alias="format"),
+    default_category: str = "Outros",
+    encoding: str = "utf-8-sig",
+    chunk_size: int = Query(settings.IMPORT_CHUNK_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    file_format = file_format or importer.detect_format(file.filename, file.content_type)
+    if file_format is None:
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        raise HTTPException(status_code=400, detail="Unknown encoding")
+    return importer.import_transactions(
+        db,
+        user_id=current_user.id,
+        file_format=file_format,
+        stream=file.file,
+        chunk_size=chunk_size,
+        max_reported_errors=settings.IMPORT_MAX_REPORTED_ERRORS,
+        encoding=encoding,
+        default_category=default_category,
+    )
+
+@router.post("/batch", response_model=TransactionBatchResult, summary="Criar, atualizar e excluir transações em lote",
+    description="Este endpoint aplica uma lista de operações (`create` com `data`, `update` com `id` e `data` parcial, `delete` com `id`) às transações do usuário autenticado, em uma única transação do banco: a posse de todos os ids é verificada em uma consulta e cada tipo de operação é gravado em um único comando. A resposta traz o resultado de cada operação, na ordem do lote, com o `status` que a rota individual devolveria (`201`, `200`, `403`, `404`) e a transação resultante (na exclusão, a removida) ou o erro. Uma operação recusada não impede as demais; um mesmo `id` só pode aparecer uma vez por lote (`409` nas repetições). No máximo `TRANSACTION_BATCH_MAX_OPERATIONS` operações (padrão 500) por requisição.",
+    responses={
+        200: {
+            "description": "Resultado de cada operação",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "results": [
+                            {
+                                "index": 0,
+                                "op": "create",
+                                "id": 3,
+                                "status": 201,
+                                "transaction": {
+                                    "id": 3,
+                                    "amount": 42.50,
+                                    "currency": "BRL",
+                                    "description": "Padaria",
+                                    "type": "expense",
+                                    "date": "2025-04-29T08:00:00",
+                                    "is_recurring": False,
+                                    "frequency": "monthly",
+                                    "category": "Alimentação",
+                                    "end_date": None,
+                                    "user_id": 1,
+                                    "created_at": "2025-04-29T08:00:00",
+                                    "updated_at": None,
+                                    "occurrence_of": None
+                                },
+                                "error": None
+                            },
+                            {
+                                "index": 1,
+                                "op": "delete",
+                                "id": 7,
+                                "status": 404,
+                                "transaction": None,
+                                "error": "Transaction not found"
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        422: {
+            "description": "Lote vazio, inválido ou acima do limite de operações",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Too many operations in batch (max 500)"
+                    }
+                }
+            }
+        }
+    })
+def batch_transactions(
+    batch: TransactionBatch,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    if len(batch.operations) > settings.TRANSACTION_BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Too many operations in batch (max {settings.TRANSACTION_BATCH_MAX_OPERATIONS})",
+        )
+    results = transaction_crud.batch_user_transactions(db, user_id=current_user.id, operations=batch.operations)
+    return {"results": results}
+
+@router.get("/export", response_class=StreamingResponse, summary="Exportar transações",
+    description="Este endpoint exporta todo o histórico de transações do usuário autenticado em NDJSON (uma transação por linha) ou CSV, em ordem cronológica. A resposta é enviada em streaming a partir de um cursor no servidor, com memória constante, e pode ser filtrada por `date_from` (inclusivo) e `date_to` (exclusivo). Com `expand_recurring=true` as ocorrências das transações recorrentes (sem `date_to`, até o fim do dia de hoje) são intercaladas na ordem cronológica, com `occurrence_of` preenchido.",
+    responses={
+        200: {
+            "description": "Arquivo de exportação",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"id": 1, "amount": 100.0, "currency": "BRL", "description": "Compra no supermercado", "type": "expense", "date": "2025-04-28T12:00:00", "is_recurring": false, "frequency": "monthly", "category": "Alimentação", "end_date": null, "created_at": "2025-04-28T12:00:00", "updated_at": null, "occurrence_of": null}\n'
+                },
+                "text/csv": {
+                    "example": "id,amount,currency,description,type,date,is_recurring,frequency,category,end_date,created_at,updated_at,occurrence_of\n1,100.0,BRL,Compra no supermercado,expense,2025-04-28T12:00:00,False,monthly,Alimentação,,2025-04-28T12:00:00,,\n"
+                }
+            }
+        },
+        401: {
+            "description": "Usuário não autenticado",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Not authenticated"
+                    }
+                }
+            }
+        }
+    })
+def export_transactions(
+    file_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    expand_recurring: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    occurrences = None
+    if expand_recurring:
+        version = transaction_crud.get_transactions_version(db, current_user.id)
+        occurrences = recurrence.get_occurrences(
+            db, current_user.id, version.transactions_version, date_from, date_to
+        )
+    return StreamingResponse(
+        exporter.stream_transactions(
+            user_id=current_user.id,
+            file_format=file_format,
+            date_from=date_from,
+            date_to=date_to,
+            batch_size=settings.EXPORT_BATCH_SIZE,
+            occurrences=occurrences,
+            session_factory=read_sessionmaker(current_user.id),
+        ),
+        media_type=exporter.MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{file_format}"'},
+    )
+
 @router.get("/{transaction_id}", response_model=Transaction, summary="Obter detalhes de uma transação",
-    description="Este endpoint retorna os detalhes de uma transação específica do usuário autenticado. O usuário só pode acessar suas próprias transações.",
+    description="Este endpoint retorna os detalhes de uma transação específica do usuário autenticado. O usuário só pode acessar suas próprias transações. Suporta GET condicional (`ETag`/`If-None-Match`, `304`).",
     responses={
         200: {
             "description": "Detalhes da transação",
@@ -105,19 +557,25 @@ def create_transaction(
                     "example": {
                         "id": 1,
                         "amount": 100.00,
+                        "currency": "BRL",
                         "description": "Compra no supermercado",
                         "type": "expense",
                         "date": "2025-04-28T12:00:00",
                         "is_recurring": False,
+                        "frequency": "monthly",
                         "category": "Alimentação",
                         "end_date": None,
                         "user_id": 1,
                         "created_at": "2025-04-28T12:00:00",
-                        "updated_at": None
+                        "updated_at": None,
+                        "occurrence_of": None
                     }
                 }
             }
         },
+        304: {
+            "description": "Sem alterações desde a versão informada em `If-None-Match` ou `If-Modified-Since`"
+        },
         404: {
             "description": "Transação não encontrada",
             "content": {
@@ -140,16 +598,24 @@ def create_transaction(
         }
     })
 def read_transaction(
+    request: Request,
     transaction_id: int, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
+    # Existência e posse antes dos validadores: um id inexistente ou de
+    # outro usuário nunca responde 304 (nem com If-None-Match: *)
     db_transaction = transaction_crud.get_transaction(db, transaction_id=transaction_id)
     if db_transaction is None:
         raise HTTPException(status_code=404, detail="Transaction not found")
     if db_transaction.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to access this transaction")
-    return db_transaction
+    validators = transaction_validators(
+        request, current_user.id, transaction_crud.get_transactions_version(db, current_user.id)
+    )
+    if validators.matches(request):
+        return validators.not_modified()
+    return validators.apply(ORJSONResponse(transaction_to_dict(db_transaction)))
 
 @router.put("/{transaction_id}", response_model=Transaction, summary="Atualizar uma transação",
     description="Este endpoint permite a atualização de uma transação específica do usuário autenticado.",
@@ -161,15 +627,18 @@ def read_transaction(
                     "example": {
                         "id": 1,
                         "amount": 150.00,
+                        "currency": "BRL",
                         "description": "Compra no supermercado (atualizado)",
                         "type": "expense",
                         "date": "2025-04-28T12:00:00",
                         "is_recurring": True,
+                        "frequency": "monthly",
                         "category": "Alimentação",
                         "end_date": "2025-06-01T00:00:00",
                         "user_id": 1,
                         "created_at": "2025-04-28T12:00:00",
-                        "updated_at": "2025-05-01T12:00:00"
+                        "updated_at": "2025-05-01T12:00:00",
+                        "occurrence_of": None
                     }
                 }
             }
@@ -199,14 +668,14 @@ def update_transaction(
     transaction_id: int, 
     transaction: TransactionUpdate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_transaction = transaction_crud.get_transaction(db, transaction_id=transaction_id)
+    db_transaction = transaction_crud.update_user_transaction(
+        db=db, transaction_id=transaction_id, user_id=current_user.id, transaction=transaction
+    )
     if db_transaction is None:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-    if db_transaction.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to update this transaction")
-    return transaction_crud.update_transaction(db=db, transaction_id=transaction_id, transaction=transaction)
+        _raise_not_found_or_forbidden(db, transaction_id, "update")
+    return db_transaction
 
 @router.delete("/{transaction_id}", response_model=Transaction, summary="Excluir uma transação",
     description="Este endpoint permite excluir uma transação específica do usuário autenticado.",
@@ -218,15 +687,18 @@ def update_transaction(
                     "example": {
                         "id": 1,
                         "amount": 100.00,
+                        "currency": "BRL",
                         "description": "Compra no supermercado",
                         "type": "expense",
                         "date": "2025-04-28T12:00:00",
                         "is_recurring": False,
+                        "frequency": "monthly",
                         "category": "Alimentação",
                         "end_date": None,
                         "user_id": 1,
                         "created_at": "2025-04-28T12:00:00",
-                        "updated_at": None
+                        "updated_at": None,
+                        "occurrence_of": None
                     }
                 }
             }
@@ -255,11 +727,11 @@ def update_transaction(
 def delete_transaction(
     transaction_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_transaction = transaction_crud.get_transaction(db, transaction_id=transaction_id)
+    db_transaction = transaction_crud.delete_user_transaction(
+        db=db, transaction_id=transaction_id, user_id=current_user.id
+    )
     if db_transaction is None:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-    if db_transaction.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this transaction")
-    return transaction_crud.delete_transaction(db=db, transaction_id=transaction_id)
+        _raise_not_found_or_forbidden(db, transaction_id, "delete")
+    return db_transaction
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from ..crud import user as user_crud
-from ..schemas import User, UserCreate, UserUpdate
-from ..database import get_db
+from ..crud import async_user as user_crud
+from ..schemas import AccountPurge, Principal, User, UserCreate, UserUpdate
+from ..database import get_async_db
+from ..dependencies import get_async_read_db
+from ..services import purge
 from ..utils.security import get_current_active_user
+from ..utils.serialization import ORJSONResponse
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -36,11 +39,11 @@ router = APIRouter(prefix="/users", tags=["Users"])
             }
         }
     })
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = user_crud.get_user_by_email(db, email=user.email)
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await user_crud.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return user_crud.create_user(db=db, user=user)
+    return await user_crud.create_user(db=db, user=user)
 
 @router.get("/me", response_model=User,  summary="Obter informações do usuário logado",
     description="Este endpoint retorna as informações do usuário atualmente autenticado. Requer autenticação para acessar.",
@@ -69,8 +72,14 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
             }
         }
     })
-def read_users_me(current_user: User = Depends(get_current_active_user)):
-    return current_user
+async def read_users_me(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    db_user = await user_crud.get_user(db, user_id=current_user.id)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return db_user
 
 @router.patch("/me", response_model=User, summary="Atualizar informações do usuário",
     description="Atualiza informações do usuário logado. Campos opcionais: nome, email, senha.",
@@ -88,33 +97,64 @@ def read_users_me(current_user: User = Depends(get_current_active_user)):
             "content": {"application/json": {"example": {"detail": "Not authenticated"}}}
         }
     })
-def update_user_me(
+async def update_user_me(
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     if user_update.email and user_update.email != current_user.email:
-        db_user = user_crud.get_user_by_email(db, email=user_update.email)
+        db_user = await user_crud.get_user_by_email(db, email=user_update.email)
         if db_user:
             raise HTTPException(status_code=400, detail="Email already registered")
     
-    return user_crud.update_user(db, user_id=current_user.id, user=user_update)
+    return await user_crud.update_user(db, user_id=current_user.id, user=user_update)
 
 
 @router.delete("/me", response_model=User, summary="Deletar usuário logado",
-    description="Remove permanentemente a conta do usuário autenticado.",
+    description="Remove permanentemente a conta do usuário autenticado. Contas com mais de `PURGE_SYNC_MAX_ROWS` transações (padrão 10000) são desativadas na hora e removidas em segundo plano: a resposta é `202` com o registro da exclusão, cujo progresso é consultado em `GET /users/purges/{purge_id}` (header `Location`). O e-mail só fica livre quando a exclusão termina.",
     responses={
         200: {
             "description": "Usuário deletado com sucesso",
             "content": {"application/json": {"example": {"id": 1, "email": "user@example.com", "name": "John Doe", "is_active": True}}}
         },
+        202: {
+            "description": "Conta desativada; exclusão em segundo plano",
+            "content": {"application/json": {"example": {"id": "3f2b9c0d8e7a4f6b9a1c2d3e4f5a6b7c", "status": "pending", "total_rows": 250000, "deleted_rows": 0, "error": None, "created_at": "2025-04-28T12:00:00Z", "updated_at": None, "finished_at": None}}}
+        },
         401: {
             "description": "Não autenticado",
             "content": {"application/json": {"example": {"detail": "Not authenticated"}}}
         }
     })
-def delete_user_me(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def delete_user_me(
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    return user_crud.delete_user(db, user_id=current_user.id)
\ No newline at end of file
+    if await db.run_sync(purge.is_large_account, current_user.id):
+        account_purge = await db.run_sync(purge.start_account_purge, current_user.id)
+        background_tasks.add_task(purge.run_account_purge, account_purge.id)
+        return ORJSONResponse(
+            AccountPurge.model_validate(account_purge).model_dump(),
+            status_code=202,
+            headers={"Location": f"/users/purges/{account_purge.id}"},
+        )
+    return await user_crud.delete_user(db, user_id=current_user.id)
+
+@router.get("/purges/{purge_id}", response_model=AccountPurge, summary="Progresso da exclusão de uma conta",
+    description="Este endpoint retorna o andamento da exclusão em segundo plano iniciada por `DELETE /users/me`: `status` (`pending`, `running`, `done` ou `failed`) e linhas removidas (`deleted_rows`) de `total_rows`. Não exige autenticação, já que o usuário é desativado ao iniciar a exclusão; o identificador é aleatório e só é conhecido por quem a iniciou. Exclusões interrompidas são retomadas por `python -m app.cli purge`.",
+    responses={
+        200: {
+            "description": "Progresso da exclusão",
+            "content": {"application/json": {"example": {"id": "3f2b9c0d8e7a4f6b9a1c2d3e4f5a6b7c", "status": "running", "total_rows": 250000, "deleted_rows": 120000, "error": None, "created_at": "2025-04-28T12:00:00Z", "updated_at": "2025-04-28T12:00:41Z", "finished_at": None}}}
+        },
+        404: {
+            "description": "Exclusão não encontrada",
+            "content": {"application/json": {"example": {"detail": "Purge not found"}}}
+        }
+    })
+async def read_account_purge(purge_id: str, db: AsyncSession = Depends(get_async_db)):
+    account_purge = await db.run_sync(purge.get_account_purge, purge_id)
+    if account_purge is None:
+        raise HTTPException(status_code=404, detail="Purge not found")
+    return account_purge
\ No newline at end of file
@@ -1,5 +1,8 @@
-from .user import User, UserCreate, UserUpdate
-from .transaction import Transaction, TransactionCreate, TransactionUpdate
+from .user import AccountPurge, User, UserCreate, UserUpdate
+from .transaction import Transaction, TransactionCreate, TransactionUpdate, TransactionFilters, TransactionPage, TransactionSummary, TransactionImportResult, TransactionBatch, TransactionBatchResult
+from .analytics import BalanceSeries
+from .budget import Budget, BudgetCreate, BudgetUpdate, BudgetStatus
+from .category import Category, CategoryUpdate
 
 # Esquema para autenticação
 from pydantic import BaseModel
@@ -10,4 +13,10 @@ class Token(BaseModel):
     token_type: str
 
 class TokenData(BaseModel):
-    email: Optional[str] = None
\ No newline at end of file
+    email: Optional[str] = None
+
+# Usuário autenticado, na forma mínima que as rotas protegidas precisam
+class Principal(BaseModel):
+    id: int
+    email: str
+    is_active: bool
\ No newline at end of file
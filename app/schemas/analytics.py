@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import date
+
+# Série diária de saldo; dates, net e balance têm o mesmo tamanho
+class BalanceSeries(BaseModel):
+    date_from: date
+    date_to: date
+    as_of: date
+    currency: str
+    opening_balance: float
+    dates: List[date]
+    net: List[float]
+    balance: List[float]
@@ -0,0 +1,50 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import date, datetime
+from typing_extensions import Annotated
+from ..utils.money import DEFAULT_CURRENCY, Currency, Money
+
+PositiveMoney = Annotated[Money, Field(gt=0)]
+
+class BudgetBase(BaseModel):
+    category: str
+    # Limite mensal (só gastos na moeda do orçamento contam) e fração do
+    # limite que dispara o alerta
+    amount: PositiveMoney
+    currency: Currency = DEFAULT_CURRENCY
+    alert_threshold: float = Field(0.8, gt=0, le=1)
+
+class BudgetCreate(BudgetBase):
+    pass
+
+class BudgetUpdate(BaseModel):
+    category: Optional[str] = None
+    amount: Optional[PositiveMoney] = None
+    currency: Optional[Currency] = None
+    alert_threshold: Optional[float] = Field(None, gt=0, le=1)
+
+class Budget(BudgetBase):
+    id: int
+    user_id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class BudgetStatusItem(BaseModel):
+    budget_id: int
+    category: str
+    amount: Money
+    currency: str
+    alert_threshold: float
+    spent: Money
+    count: int
+    remaining: Money
+    ratio: float
+    alert: bool
+    exceeded: bool
+
+class BudgetStatus(BaseModel):
+    month: date
+    items: List[BudgetStatusItem]
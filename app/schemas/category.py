@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+class CategoryUpdate(BaseModel):
+    name: str = Field(min_length=1)
+
+class Category(BaseModel):
+    id: int
+    user_id: int
+    name: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
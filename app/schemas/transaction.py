@@ -1,13 +1,20 @@
-from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, validator
+from typing import List, Literal, Optional, Union
+from typing_extensions import Annotated
+from datetime import date as date_type, datetime
+from ..utils.dates import naive_utc
+from ..utils.money import DEFAULT_CURRENCY, Currency, Money
+
+Frequency = Literal["daily", "weekly", "monthly", "yearly"]
 
 class TransactionBase(BaseModel):
-    amount: float
+    amount: Money
+    currency: Currency = DEFAULT_CURRENCY
     description: str 
     type: str  
     date: datetime
     is_recurring: Optional[bool] = False
+    frequency: Frequency = "monthly"
     category: str
     end_date: Optional[datetime] = None
 
@@ -15,11 +22,13 @@ class TransactionCreate(TransactionBase):
     pass
 
 class TransactionUpdate(BaseModel):
-    amount: Optional[float] = None
+    amount: Optional[Money] = None
+    currency: Optional[Currency] = None
     description: Optional[str] = None
     type: Optional[str] = None
     date: Optional[datetime] = None
     is_recurring: Optional[bool] = None
+    frequency: Optional[Frequency] = None
     category: Optional[str] = None
     end_date: Optional[datetime] = None
 
@@ -28,6 +37,91 @@ class Transaction(TransactionBase):
     user_id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+    # Nas ocorrências geradas de uma recorrente: id da transação de origem
+    occurrence_of: Optional[int] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Filtros da listagem (query string); date_from inclusivo, date_to exclusivo
+class TransactionFilters(BaseModel):
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    category: Optional[str] = None
+    type: Optional[str] = None
+    min_amount: Optional[Money] = None
+    max_amount: Optional[Money] = None
+    is_recurring: Optional[bool] = None
+
+    # Datas com fuso são comparadas em UTC, como as gravadas
+    @validator('date_from', 'date_to')
+    def dates_to_naive_utc(cls, value):
+        return naive_utc(value)
+
+class TransactionPage(BaseModel):
+    items: List[Transaction]
+    next_cursor: Optional[str] = None
+
+class TransactionSummaryItem(BaseModel):
+    period: Optional[date_type] = None
+    category: Optional[str] = None
+    type: Optional[str] = None
+    currency: Optional[str] = None
+    total: Money
+    count: int
+    average: Money
+
+class TransactionSummary(BaseModel):
+    period: Optional[str] = None
+    group_by: List[str] = []
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    items: List[TransactionSummaryItem]
+
+class TransactionImportError(BaseModel):
+    row: int
+    error: str
+
+class TransactionImportResult(BaseModel):
+    format: str
+    processed: int
+    inserted: int
+    duplicates: int
+    failed: int
+    errors: List[TransactionImportError] = []
+    errors_truncated: bool = False
+
+# Lote de escritas (POST /transactions/batch), identificadas pelo campo op
+class TransactionBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: TransactionCreate
+
+class TransactionBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: TransactionUpdate
+
+class TransactionBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+TransactionBatchOperation = Annotated[
+    Union[TransactionBatchCreate, TransactionBatchUpdate, TransactionBatchDelete],
+    Field(discriminator="op"),
+]
+
+class TransactionBatch(BaseModel):
+    operations: List[TransactionBatchOperation] = Field(min_length=1)
+
+# Resultado de cada operação, na ordem do lote; status como o da rota
+# individual equivalente (201, 200, 403, 404) ou 409 para id repetido
+class TransactionBatchItem(BaseModel):
+    index: int
+    op: str
+    id: Optional[int] = None
+    status: int
+    transaction: Optional[Transaction] = None
+    error: Optional[str] = None
+
+class TransactionBatchResult(BaseModel):
+    results: List[TransactionBatchItem]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, constr, validator
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime, date  # Adicione date
 import re
 
@@ -61,4 +61,18 @@ class User(UserBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Progresso da exclusão em segundo plano de uma conta (GET /users/purges/{id})
+class AccountPurge(BaseModel):
+    id: str
+    status: Literal["pending", "running", "done", "failed"]
+    total_rows: int
+    deleted_rows: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
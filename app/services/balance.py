@@ -0,0 +1,75 @@
+from datetime import date, datetime, time
+from typing import Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..crud import transaction as transaction_crud
+from ..utils.money import DEFAULT_CURRENCY, MINOR_UNITS, cents_to_float
+from .recurrence import as_days, occurrence_days
+
+# Saldo diário e previsão de fluxo de caixa. O banco agrega o histórico em
+# uma soma com sinal por dia; daí em diante tudo é vetorizado com numpy:
+# bincount distribui os valores nos dias da janela e cumsum dá o saldo. As
+# contas são em centavos (int64), convertidos para decimais só na saída, e
+# cada série é de uma moeda (sem conversão entre moedas).
+# Lançamentos recorrentes são projetados pela sua frequência (ver
+# services.recurrence) até end_date ou o fim da janela.
+
+_DAY = np.timedelta64(1, "D")
+
+def _to_day(value) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, "D")
+
+def _load(db: Session, user_id: int, until: np.datetime64, include_recurring: bool, currency: str):
+    date_to = datetime.combine(until.astype(date), time.min)
+    rows = transaction_crud.get_daily_net_amounts(db, user_id, date_to, currency)
+    days = as_days(row.day for row in rows)
+    net = np.fromiter((int(row.net) for row in rows), dtype=np.int64, count=len(rows))
+    if include_recurring:
+        recurring = transaction_crud.get_recurring_transactions(db, user_id, date_to, currency)
+        occurrences, sources = occurrence_days(
+            as_days(row.date for row in recurring),
+            as_days(row.end_date for row in recurring),
+            np.array([row.frequency for row in recurring], dtype=object),
+            until,
+        )
+        amounts = np.fromiter((row.amount_cents for row in recurring), dtype=np.int64, count=len(recurring))
+        days = np.concatenate([days, occurrences])
+        net = np.concatenate([net, amounts[sources]])
+    return days, net
+
+def balance_series(
+    db: Session,
+    user_id: int,
+    date_from: date,
+    date_to: date,
+    include_recurring: bool = True,
+    today: Optional[date] = None,
+    currency: str = DEFAULT_CURRENCY,
+) -> dict:
+    # Janela [date_from, date_to); dias depois de `as_of` são previsão
+    start, end = _to_day(date_from), _to_day(date_to)
+    length = max(int((end - start) / _DAY), 0)
+    days, net = _load(db, user_id, end, include_recurring, currency)
+
+    opening = int(net[days < start].sum())
+    inside = (days >= start) & (days < end)
+    # Pesos float64 somam inteiros exatamente (abaixo de 2**53 centavos)
+    daily = np.bincount(
+        (days[inside] - start).astype(int), weights=net[inside], minlength=length
+    )[:length].astype(np.int64)
+    balance = opening + np.cumsum(daily)
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "as_of": today or date.today(),
+        "currency": currency,
+        "opening_balance": cents_to_float(opening),
+        "dates": np.arange(start, end, _DAY).astype(date).tolist() if length else [],
+        "net": (daily / MINOR_UNITS).tolist(),
+        "balance": (balance / MINOR_UNITS).tolist(),
+    }
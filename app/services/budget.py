@@ -0,0 +1,53 @@
+from datetime import date, datetime, time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..crud import budget as budget_crud
+from ..crud import transaction as transaction_crud
+from ..utils.money import from_cents
+from . import recurrence
+
+# Situação dos orçamentos no mês: o gasto vem dos contadores de
+# category_spend (sem somar transações) e, opcionalmente, das ocorrências
+# das recorrentes no mês, que não são gravadas (services.recurrence).
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+def budget_status(db: Session, user_id: int, month: Optional[date] = None, include_recurring: bool = True) -> dict:
+    month = transaction_crud.month_start(month or date.today())
+    rows = budget_crud.get_budget_spend(db, user_id, month)
+
+    projected = {}
+    if include_recurring and rows:
+        version = transaction_crud.get_transactions_version(db, user_id)
+        for occurrence in recurrence.get_occurrences(
+            db,
+            user_id,
+            version.transactions_version,
+            datetime.combine(month, time.min),
+            datetime.combine(_next_month(month), time.min),
+        ):
+            transaction_crud.add_spend(projected, occurrence)
+
+    items = []
+    for budget, spent, count in rows:
+        # Tudo em centavos; só a razão é fracionária
+        extra_spent, extra_count = projected.get((budget.category_id, budget.currency, month), (0, 0))
+        spent = (spent or 0) + extra_spent
+        ratio = round(spent / budget.amount_cents, 4)
+        items.append({
+            "budget_id": budget.id,
+            "category": budget.category,
+            "amount": budget.amount,
+            "currency": budget.currency,
+            "alert_threshold": budget.alert_threshold,
+            "spent": from_cents(spent),
+            "count": (count or 0) + extra_count,
+            "remaining": from_cents(budget.amount_cents - spent),
+            "ratio": ratio,
+            "alert": ratio >= budget.alert_threshold,
+            "exceeded": spent > budget.amount_cents,
+        })
+    return {"month": month, "items": items}
@@ -0,0 +1,70 @@
+import csv
+import heapq
+import io
+from datetime import date, datetime
+from typing import Iterator, List, Optional
+
+import orjson
+
+from ..crud import transaction as transaction_crud
+from ..database import SessionLocal
+
+# Exportação em streaming (NDJSON ou CSV): cada lote lido do cursor no
+# servidor é codificado e enviado em seguida, com memória constante.
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+def _encode_ndjson(rows) -> bytes:
+    return b"".join(orjson.dumps(row._asdict(), option=orjson.OPT_APPEND_NEWLINE) for row in rows)
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _encode_csv(rows, header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(transaction_crud.EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+    return buffer.getvalue().encode()
+
+def stream_transactions(
+    user_id: int,
+    file_format: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    batch_size: int = 1000,
+    occurrences: Optional[List] = None,
+    session_factory=SessionLocal,
+) -> Iterator[bytes]:
+    # Sessão própria: o gerador continua rodando depois que a rota retorna
+    encode = _encode_ndjson if file_format == "ndjson" else _encode_csv
+    db = session_factory()
+    try:
+        if file_format == "csv":
+            # Cabeçalho enviado de imediato, antes da primeira consulta
+            yield _encode_csv((), header=True)
+        batch = []
+        rows = transaction_crud.iter_user_transactions(
+            db, user_id=user_id, date_from=date_from, date_to=date_to, batch_size=batch_size
+        )
+        if occurrences:
+            # Ocorrências de recorrentes (services.recurrence), já em (date, id)
+            rows = heapq.merge(rows, occurrences, key=lambda row: (row.date, row.id))
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield encode(batch)
+                batch = []
+        if batch:
+            yield encode(batch)
+    finally:
+        db.close()
@@ -0,0 +1,179 @@
+import codecs
+import csv
+import json
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from ..crud import transaction as transaction_crud
+from ..schemas.transaction import TransactionCreate
+from ..utils.dates import naive_utc
+from ..utils.money import to_cents
+
+# Importação de extratos em streaming: o arquivo é lido linha a linha e
+# processado em blocos de `chunk_size`, então a memória usada não depende
+# do tamanho do arquivo.
+
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".ofx": "ofx",
+}
+
+_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/x-ofx": "ofx",
+}
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    name = (filename or "").lower()
+    for extension, file_format in _EXTENSIONS.items():
+        if name.endswith(extension):
+            return file_format
+    return _CONTENT_TYPES.get((content_type or "").split(";")[0].strip())
+
+def _blank_to_none(row: dict) -> dict:
+    return {key: (None if value == "" else value) for key, value in row.items() if key}
+
+def iter_csv_rows(lines) -> Iterator[Tuple[int, dict]]:
+    # Cabeçalho com os campos de TransactionCreate (amount, description, ...)
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, _blank_to_none(row)
+
+def iter_ndjson_rows(lines) -> Iterator[Tuple[int, dict]]:
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+def _parse_ofx_date(value: str) -> datetime:
+    # 20250428120000[-3:BRT] -> 2025-04-28 12:00:00 (fuso descartado)
+    digits = value.split("[")[0].split(".")[0]
+    return datetime.strptime(digits[:14].ljust(14, "0"), "%Y%m%d%H%M%S")
+
+def iter_ofx_rows(lines, default_category: str) -> Iterator[Tuple[int, dict]]:
+    # OFX 1.x (SGML) e 2.x (XML): apenas os blocos <STMTTRN> interessam
+    current = None
+    count = 0
+    for line in lines:
+        for closing, tag, text in _OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    count += 1
+                    yield count, _ofx_to_row(current, default_category)
+                    current = None
+                elif not closing:
+                    current = {}
+            elif current is not None and not closing and text.strip():
+                current[tag] = text.strip()
+
+def _ofx_to_row(fields: dict, default_category: str) -> dict:
+    try:
+        amount = Decimal(fields.get("TRNAMT", "").replace(",", "."))
+        date = _parse_ofx_date(fields.get("DTPOSTED", ""))
+    except (ValueError, InvalidOperation):
+        return {}
+    return {
+        "amount": abs(amount),
+        "type": "income" if amount > 0 else "expense",
+        "date": date,
+        "description": fields.get("MEMO") or fields.get("NAME") or "",
+        "category": default_category,
+    }
+
+def iter_rows(file_format: str, stream: BinaryIO, encoding: str, default_category: str):
+    lines = codecs.getreader(encoding)(stream, errors="replace")
+    if file_format == "csv":
+        return iter_csv_rows(lines)
+    if file_format == "ndjson":
+        return iter_ndjson_rows(lines)
+    return iter_ofx_rows(lines, default_category)
+
+def _error_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+def import_transactions(
+    db: Session,
+    user_id: int,
+    file_format: str,
+    stream: BinaryIO,
+    chunk_size: int,
+    max_reported_errors: int,
+    encoding: str = "utf-8-sig",
+    default_category: str = "Outros",
+) -> dict:
+    report = {
+        "format": file_format,
+        "processed": 0,
+        "inserted": 0,
+        "duplicates": 0,
+        "failed": 0,
+        "errors": [],
+        "errors_truncated": False,
+    }
+
+    def add_error(row_number: int, message: str):
+        report["failed"] += 1
+        if len(report["errors"]) < max_reported_errors:
+            report["errors"].append({"row": row_number, "error": message})
+        else:
+            report["errors_truncated"] = True
+
+    def flush(chunk: List[TransactionCreate]):
+        # Duplicatas: contra o banco (inclui blocos anteriores já gravados)
+        # e dentro do próprio bloco
+        seen = transaction_crud.get_existing_fingerprints(db, user_id, (t.date for t in chunk))
+        fresh = []
+        for transaction in chunk:
+            fingerprint = transaction_crud.transaction_fingerprint(
+                to_cents(transaction.amount), transaction.date, transaction.description
+            )
+            if fingerprint in seen:
+                report["duplicates"] += 1
+                continue
+            seen.add(fingerprint)
+            fresh.append(transaction)
+        report["inserted"] += transaction_crud.bulk_create_transactions(db, fresh, user_id=user_id)
+        db.commit()
+
+    chunk = []
+    for row_number, row in iter_rows(file_format, stream, encoding, default_category):
+        report["processed"] += 1
+        if not isinstance(row, dict) or not row:
+            add_error(row_number, "Invalid row")
+            continue
+        try:
+            transaction = TransactionCreate(**row)
+        except ValidationError as exc:
+            add_error(row_number, _error_message(exc))
+            continue
+        # Datas com fuso (CSV/NDJSON) em UTC sem fuso, como as gravadas: o
+        # fingerprint e a comparação com o banco usam o mesmo valor
+        chunk.append(transaction.copy(update={
+            "date": naive_utc(transaction.date),
+            "end_date": naive_utc(transaction.end_date),
+        }))
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+    return report
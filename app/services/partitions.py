@@ -0,0 +1,98 @@
+import re
+from datetime import date
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..crud.transaction import ARCHIVE_COLUMNS
+
+# Partições mensais de transactions no PostgreSQL (migração 0010): uma por
+# mês de `date` (transactions_y2026m10) e a padrão (transactions_default)
+# para o que estiver fora delas. Sem partições à frente, as transações
+# novas caem na padrão: rode `python -m app.cli partitions` periodicamente.
+
+PARTITION_NAME = re.compile(r"^transactions_y(\d{4})m(\d{2})$")
+DEFAULT_PARTITION = "transactions_default"
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"transactions_y{month.year:04d}m{month.month:02d}"
+
+def is_partitioned(db: Session) -> bool:
+    # Bancos criados por create_all (benchmarks) têm a tabela simples
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('transactions'))")
+    ).scalar()
+
+def get_partitions(db: Session) -> Dict[date, str]:
+    # Mês -> nome das partições mensais existentes
+    names = db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('transactions')"
+        )
+    ).scalars()
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+def create_partition(db: Session, month: date):
+    # O PostgreSQL não cria a partição enquanto a padrão tiver linhas do
+    # intervalo: elas saem da padrão (travada contra novas inserções até o
+    # commit) por uma tabela temporária e voltam pela tabela-mãe, já na
+    # partição nova
+    start, end = month, add_months(month, 1)
+    columns = ", ".join(ARCHIVE_COLUMNS)
+    month_rows = f"FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end"
+    bounds = {"start": start, "end": end}
+    db.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE"))
+    db.execute(text(f"CREATE TEMPORARY TABLE moved_transactions ON COMMIT DROP AS SELECT {columns} {month_rows}"), bounds)
+    db.execute(text(f"DELETE {month_rows}"), bounds)
+    db.execute(
+        text(
+            f"CREATE TABLE {partition_name(month)} PARTITION OF transactions "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+    db.execute(text(f"INSERT INTO transactions ({columns}) SELECT {columns} FROM moved_transactions"))
+
+def create_partitions(db: Session, since: date, through: date) -> List[str]:
+    # Partições que faltam dos meses de `since` a `through` (a partir do
+    # corte do arquivo, as linhas quentes que caíram na padrão vão para a
+    # partição do seu mês), uma transação por partição
+    existing = get_partitions(db)
+    created = []
+    month = since.replace(day=1)
+    while month <= through:
+        if month not in existing:
+            create_partition(db, month)
+            db.commit()
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+def drop_empty_partitions(db: Session, before: date) -> List[str]:
+    # Partições de meses inteiros anteriores a `before` que o arquivamento
+    # esvaziou. A partição fica travada entre a verificação e o DROP; uma
+    # transação antiga inserida depois cai na padrão
+    dropped = []
+    for month, name in sorted(get_partitions(db).items()):
+        if add_months(month, 1) > before:
+            break
+        db.execute(text(f"LOCK TABLE {name} IN ACCESS EXCLUSIVE MODE"))
+        if db.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar():
+            db.rollback()
+            continue
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+        dropped.append(name)
+    return dropped
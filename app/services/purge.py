@@ -0,0 +1,137 @@
+import logging
+import uuid
+from typing import List, Optional
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.transaction import Transaction, TransactionArchive
+from ..models.user import AccountPurge, User
+from ..utils.security import invalidate_principal
+
+# Exclusão de contas (DELETE /users/me). As tabelas do usuário têm ON DELETE
+# CASCADE, então uma conta pequena sai com um DELETE em users. Numa conta
+# grande esse DELETE seria um único statement longo, segurando locks até o
+# fim: o usuário é desativado na hora e as transações são removidas em
+# lotes, um commit por lote, com o progresso em account_purges. A linha de
+# users sai por último e leva o restante (categorias, orçamentos e
+# contadores, pequenos) pelo cascade.
+
+logger = logging.getLogger("app.purge")
+
+# Tabelas removidas em lotes, nesta ordem
+CHUNKED_MODELS = (Transaction, TransactionArchive)
+
+def count_account_rows(db: Session, user_id: int, limit: Optional[int] = None) -> int:
+    # Linhas das tabelas grandes; com limit, conta no máximo limit + 1 por
+    # tabela (basta para saber se passa do limite)
+    total = 0
+    for model in CHUNKED_MODELS:
+        rows = select(model.id).where(model.user_id == user_id)
+        if limit is not None:
+            rows = rows.limit(limit + 1)
+        total += db.execute(select(func.count()).select_from(rows.subquery())).scalar()
+    return total
+
+def is_large_account(db: Session, user_id: int) -> bool:
+    limit = settings.PURGE_SYNC_MAX_ROWS
+    return count_account_rows(db, user_id, limit) > limit
+
+def start_account_purge(db: Session, user_id: int) -> AccountPurge:
+    # Desativa o usuário (login e tokens já emitidos deixam de valer) e
+    # registra a exclusão pendente, executada por run_account_purge
+    db.execute(update(User).where(User.id == user_id).values(is_active=False))
+    purge = AccountPurge(id=uuid.uuid4().hex, user_id=user_id, total_rows=count_account_rows(db, user_id))
+    db.add(purge)
+    db.commit()
+    db.refresh(purge)
+    invalidate_principal(user_id)
+    return purge
+
+def _delete_batch(db: Session, model, user_id: int, batch_size: int) -> int:
+    # Um lote em ordem de (date, id). O intervalo de datas do lote entra no
+    # DELETE para o PostgreSQL tocar só as partições dele
+    rows = db.execute(
+        select(model.id, model.date)
+        .where(model.user_id == user_id)
+        .order_by(model.date, model.id)
+        .limit(batch_size)
+    ).all()
+    if not rows:
+        return 0
+    return db.execute(
+        delete(model)
+        .where(
+            model.user_id == user_id,
+            model.id.in_([row.id for row in rows]),
+            model.date >= rows[0].date,
+            model.date <= rows[-1].date,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+def _minutes_ago(db: Session, minutes: int):
+    # Instante de `minutes` minutos atrás no relógio do banco (o mesmo de
+    # created_at e updated_at)
+    if db.get_bind().dialect.name == "sqlite":
+        return func.datetime("now", f"-{minutes} minutes")
+    return func.now() - func.make_interval(0, 0, 0, 0, 0, minutes)
+
+def _claim(db: Session, purge_id: str, stale_minutes: Optional[int]) -> bool:
+    # Marca como running se estiver pendente, falha ou (com stale_minutes)
+    # parada há mais tempo que isso; evita duas execuções da mesma exclusão
+    claimable = [AccountPurge.status.in_(("pending", "failed"))]
+    if stale_minutes is not None:
+        stale = func.coalesce(AccountPurge.updated_at, AccountPurge.created_at) < _minutes_ago(db, stale_minutes)
+        claimable.append((AccountPurge.status == "running") & stale)
+    claimed = db.execute(
+        update(AccountPurge)
+        .where(AccountPurge.id == purge_id, or_(*claimable))
+        .values(status="running", error=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return bool(claimed)
+
+def run_account_purge(purge_id: str, batch_size: Optional[int] = None, stale_minutes: Optional[int] = None) -> bool:
+    # Executa (ou retoma) uma exclusão em sessão própria: roda em segundo
+    # plano, depois da resposta. O progresso é gravado no commit de cada
+    # lote. Devolve False se a exclusão não existe ou já está com outro
+    # processo
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    db = SessionLocal()
+    try:
+        if not _claim(db, purge_id, stale_minutes):
+            return False
+        user_id = db.execute(select(AccountPurge.user_id).where(AccountPurge.id == purge_id)).scalar()
+        progress = update(AccountPurge).where(AccountPurge.id == purge_id).execution_options(synchronize_session=False)
+        try:
+            for model in CHUNKED_MODELS:
+                while True:
+                    deleted = _delete_batch(db, model, user_id, batch_size)
+                    if not deleted:
+                        break
+                    db.execute(progress.values(deleted_rows=AccountPurge.deleted_rows + deleted))
+                    db.commit()
+            db.execute(delete(User).where(User.id == user_id))
+            db.execute(progress.values(status="done", finished_at=func.now()))
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.exception("Account purge %s failed", purge_id)
+            db.execute(progress.values(status="failed", error=str(exc)[:1000]))
+            db.commit()
+        invalidate_principal(user_id)
+        return True
+    finally:
+        db.close()
+
+def get_account_purge(db: Session, purge_id: str) -> Optional[AccountPurge]:
+    return db.get(AccountPurge, purge_id)
+
+def get_unfinished_purge_ids(db: Session) -> List[str]:
+    return db.execute(
+        select(AccountPurge.id).where(AccountPurge.status != "done").order_by(AccountPurge.created_at)
+    ).scalars().all()
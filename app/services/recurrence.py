@@ -0,0 +1,245 @@
+import heapq
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..crud import transaction as transaction_crud
+from ..schemas.transaction import TransactionFilters
+from ..utils.cache import TTLCache
+from ..utils.dates import naive_utc
+from ..utils.money import average_cents, cents_to_float, from_cents, to_cents
+from ..utils.pagination import encode_cursor
+
+# Expansão das transações recorrentes em ocorrências, sem gravá-las. A linha
+# armazenada é a primeira ocorrência; as seguintes (mesmo horário, a cada
+# dia/semana/mês/ano, com o dia limitado ao fim do mês) são geradas sob
+# demanda até end_date ou o horizonte pedido. Cada usuário tem um índice
+# de ocorrências em cache, validado pela versão dos seus dados
+# (users.transactions_version): qualquer escrita, inclusive em uma
+# recorrente, gera outro índice no próximo acesso, em qualquer worker.
+
+DAY_STEPS = {"daily": 1, "weekly": 7}
+MONTH_STEPS = {"monthly": 1, "yearly": 12}
+
+_DAY = np.timedelta64(1, "D")
+
+occurrence_cache = TTLCache(
+    maxsize=settings.RECURRENCE_CACHE_SIZE,
+    ttl=settings.RECURRENCE_CACHE_TTL_SECONDS,
+)
+
+def _expand(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Para cada ocorrência: índice da origem e passo (1..counts[i])
+    row = np.repeat(np.arange(len(counts)), counts)
+    step = np.arange(len(row)) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    return row, step
+
+def occurrence_days(
+    dates: np.ndarray,
+    end_dates: np.ndarray,
+    frequencies: np.ndarray,
+    until: np.datetime64,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Dias (datetime64[D]) das ocorrências seguintes de cada origem, até
+    # end_date (inclusivo) e antes de until, com o índice da origem de cada um
+    last = np.where(np.isnat(end_dates), until - _DAY, np.minimum(end_dates, until - _DAY))
+    days, rows = [np.array([], dtype="datetime64[D]")], [np.array([], dtype=int)]
+
+    for frequency, size in DAY_STEPS.items():
+        (index,) = np.nonzero(frequencies == frequency)
+        counts = np.maximum((last[index] - dates[index]).astype(int) // size, 0)
+        row, step = _expand(counts)
+        days.append(dates[index][row] + (step * size).astype("timedelta64[D]"))
+        rows.append(index[row])
+
+    for frequency, size in MONTH_STEPS.items():
+        (index,) = np.nonzero(frequencies == frequency)
+        start_months = dates[index].astype("datetime64[M]")
+        counts = np.maximum((last[index].astype("datetime64[M]") - start_months).astype(int) // size, 0)
+        row, step = _expand(counts)
+        months = start_months[row] + (step * size).astype("timedelta64[M]")
+        month_start = months.astype("datetime64[D]")
+        month_length = ((months + 1).astype("datetime64[D]") - month_start).astype(int)
+        day_of_month = (dates[index] - start_months.astype("datetime64[D]")).astype(int)[row]
+        occurrences = month_start + np.minimum(day_of_month, month_length - 1).astype("timedelta64[D]")
+        keep = occurrences <= last[index][row]
+        days.append(occurrences[keep])
+        rows.append(index[row][keep])
+
+    return np.concatenate(days), np.concatenate(rows)
+
+def as_days(values: Iterable) -> np.ndarray:
+    # date, datetime, 'YYYY-MM-DD...' (SQLite) ou None -> datetime64[D]
+    return np.array([str(value)[:10] if value is not None else "NaT" for value in values], dtype="datetime64[D]")
+
+def default_until() -> datetime:
+    # Sem date_to: ocorrências até o fim do dia de hoje
+    return datetime.combine(date.today() + timedelta(days=1), time.min)
+
+def horizon() -> datetime:
+    return default_until() + timedelta(days=settings.RECURRENCE_HORIZON_DAYS)
+
+class Occurrence:
+    # Mesmos atributos de Transaction; id é o da origem (editar ou excluir
+    # a série) e occurrence_of indica que a linha foi gerada
+    def __init__(self, source, when: datetime):
+        self.__dict__.update(source)
+        self.date = when
+        self.occurrence_of = source["id"]
+
+    @property
+    def amount(self):
+        return from_cents(self.amount_cents)
+
+    def _asdict(self) -> dict:
+        # Mesmos valores das linhas exportadas (amount como float)
+        row = {column: getattr(self, column) for column in transaction_crud.EXPORT_COLUMNS}
+        row["amount"] = cents_to_float(self.amount_cents)
+        return row
+
+    def __iter__(self):
+        return iter(self._asdict().values())
+
+class OccurrenceIndex:
+    def __init__(self, version: int, sources: List[dict]):
+        self.version = version
+        self.sources = sources
+        self._dates = as_days(source["date"] for source in sources)
+        self._end_dates = as_days(source["end_date"] for source in sources)
+        self._frequencies = np.array([source["frequency"] for source in sources], dtype=object)
+        self._ids = np.array([source["id"] for source in sources], dtype=np.int64)
+        # (gerado até, dias ordenados, origem de cada dia), trocado de uma vez
+        self._state = (np.datetime64("NaT", "D"), np.array([], dtype="datetime64[D]"), np.array([], dtype=int))
+
+    def _generated(self, until: np.datetime64):
+        state = self._state
+        if np.isnat(state[0]) or state[0] < until:
+            days, rows = occurrence_days(self._dates, self._end_dates, self._frequencies, until)
+            order = np.lexsort((self._ids[rows], days))
+            state = (until, days[order], rows[order])
+            self._state = state
+        return state
+
+    def between(self, date_from: Optional[datetime], date_to: datetime) -> List[Occurrence]:
+        # Ocorrências com date_from <= data < date_to, em ordem (date, id)
+        if not self.sources:
+            return []
+        date_to = min(date_to, horizon())
+        until = np.datetime64(date_to.date(), "D") + _DAY
+        _, days, rows = self._generated(until)
+        lo = 0 if date_from is None else np.searchsorted(days, np.datetime64(date_from.date(), "D"))
+        hi = np.searchsorted(days, until)
+        occurrences = []
+        for day, row in zip(days[lo:hi].astype(date).tolist(), rows[lo:hi].tolist()):
+            source = self.sources[row]
+            when = datetime.combine(day, source["date"].time())
+            if (date_from is None or when >= date_from) and when < date_to:
+                occurrences.append(Occurrence(source, when))
+        occurrences.sort(key=sort_key)
+        return occurrences
+
+def sort_key(transaction) -> Tuple[datetime, int]:
+    return transaction.date, transaction.id
+
+def get_index(db: Session, user_id: int, version: int) -> OccurrenceIndex:
+    index = occurrence_cache.get(user_id)
+    if index is None or index.version != version:
+        sources = [row._asdict() for row in transaction_crud.get_recurring_sources(db, user_id)]
+        index = OccurrenceIndex(version, sources)
+        occurrence_cache.set(user_id, index)
+    return index
+
+def _matches(occurrence: Occurrence, filters: Optional[TransactionFilters]) -> bool:
+    if filters is None:
+        return True
+    return (
+        (filters.category is None or occurrence.category == filters.category)
+        and (filters.type is None or occurrence.type == filters.type)
+        and (filters.is_recurring is None or filters.is_recurring)
+        and (filters.min_amount is None or occurrence.amount_cents >= to_cents(filters.min_amount))
+        and (filters.max_amount is None or occurrence.amount_cents <= to_cents(filters.max_amount))
+    )
+
+def get_occurrences(
+    db: Session,
+    user_id: int,
+    version: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    filters: Optional[TransactionFilters] = None,
+) -> List[Occurrence]:
+    # Janela [date_from, date_to); sem date_to, até o fim de hoje
+    occurrences = get_index(db, user_id, version).between(naive_utc(date_from), naive_utc(date_to) or default_until())
+    return [occurrence for occurrence in occurrences if _matches(occurrence, filters)]
+
+def merge_offset_page(fetch, occurrences: List[Occurrence], skip: int, limit: int) -> list:
+    # Página [skip, skip + limit) da lista (date DESC, id DESC) com as
+    # ocorrências intercaladas. fetch(offset, limit) lê as armazenadas: com
+    # M ocorrências na janela, basta ler limit + M linhas a partir de
+    # skip - M, em vez de todas as anteriores à página.
+    extra = len(occurrences)
+    offset = max(0, skip - extra)
+    rows = fetch(offset, limit + extra)
+    if offset and not rows:
+        return []
+    occurrences = sorted(occurrences, key=sort_key, reverse=True)
+    start = 0
+    if offset:
+        first = sort_key(rows[0])
+        ahead = [occurrence for occurrence in occurrences if sort_key(occurrence) > first]
+        start = offset + len(ahead)
+        occurrences = occurrences[len(ahead):]
+    if len(rows) == limit + extra:
+        last = sort_key(rows[-1])
+        occurrences = [occurrence for occurrence in occurrences if sort_key(occurrence) > last]
+    merged = list(heapq.merge(rows, occurrences, key=sort_key, reverse=True))
+    return merged[skip - start:skip - start + limit]
+
+def merge_keyset_page(
+    rows: list,
+    next_cursor: Optional[str],
+    occurrences: List[Occurrence],
+    limit: int,
+    cursor: Optional[Tuple[datetime, int]] = None,
+) -> Tuple[list, Optional[str]]:
+    # rows/next_cursor: página das armazenadas depois do cursor. As
+    # ocorrências usam a mesma chave (date, id), então o cursor vale para ambas
+    if cursor is not None:
+        occurrences = [occurrence for occurrence in occurrences if sort_key(occurrence) < tuple(cursor)]
+    occurrences = sorted(occurrences, key=sort_key, reverse=True)[:limit + 1]
+    merged = list(heapq.merge(rows, occurrences, key=sort_key, reverse=True))
+    if len(merged) > limit or (next_cursor is not None and merged):
+        merged = merged[:limit]
+        next_cursor = encode_cursor(merged[-1].date, merged[-1].id)
+    return merged, next_cursor
+
+def _bucket(when: datetime, period: str) -> str:
+    # Mesmo início de período que crud.transaction._period_bucket
+    day = when.date()
+    if period == "week":
+        day -= timedelta(days=day.weekday())
+    elif period == "month":
+        day = day.replace(day=1)
+    elif period == "year":
+        day = day.replace(month=1, day=1)
+    return day.isoformat()
+
+def merge_summary(items: List[dict], occurrences: List[Occurrence], period: Optional[str], group_by) -> List[dict]:
+    # Soma as ocorrências nos grupos do resumo (chaves na mesma ordem do GROUP BY)
+    # Totais decimais de duas casas: a soma continua exata
+    keys = (["period"] if period else []) + [key for key in ("category", "type", "currency") if key in group_by]
+    groups = {tuple(item[key] for key in keys): dict(item) for item in items}
+    touched = set()
+    for occurrence in occurrences:
+        values = tuple(_bucket(occurrence.date, period) if key == "period" else getattr(occurrence, key) for key in keys)
+        group = groups.setdefault(values, dict(zip(keys, values), total=from_cents(0), count=0, average=from_cents(0)))
+        group["total"] += occurrence.amount
+        group["count"] += 1
+        touched.add(values)
+    for values in touched:
+        group = groups[values]
+        group["average"] = from_cents(average_cents(to_cents(group["total"]), group["count"]))
+    return [groups[values] for values in sorted(groups)]
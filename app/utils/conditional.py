@@ -0,0 +1,96 @@
+import hashlib
+from datetime import date, datetime, time, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+# GET condicional para as leituras de transações: o ETag deriva da versão
+# dos dados do usuário (users.transactions_version) e da URL, então uma
+# revalidação custa uma leitura pela PK de users, sem consultar transações.
+# O ETag é exato; Last-Modified tem resolução de segundos (ver Validators).
+
+CACHE_CONTROL = "private, no-cache"
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite devolve datetimes sem fuso (em UTC)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+# Folga entre a última escrita e uma data de If-Modified-Since que vale 304
+IF_MODIFIED_SINCE_MARGIN = timedelta(seconds=1)
+
+def _ceil_second(value: datetime) -> datetime:
+    if value.microsecond:
+        return value.replace(microsecond=0) + timedelta(seconds=1)
+    return value
+
+class Validators:
+    def __init__(self, etag: str, last_modified: Optional[datetime]):
+        self.etag = etag
+        # Instante exato da última escrita (com microssegundos)
+        self.last_modified = _as_utc(last_modified) if last_modified else None
+        self.now = datetime.now(timezone.utc)
+
+    @property
+    def last_modified_header(self) -> Optional[str]:
+        # HTTP-date não tem frações de segundo. A data enviada fica pelo
+        # menos IF_MODIFIED_SINCE_MARGIN depois da escrita (para o 304 de
+        # matches) e só sai quando já passou; antes disso fica só o ETag
+        if self.last_modified is None:
+            return None
+        rounded = _ceil_second(self.last_modified + IF_MODIFIED_SINCE_MARGIN)
+        if rounded > self.now:
+            return None
+        return format_datetime(rounded, usegmt=True)
+
+    @property
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        last_modified = self.last_modified_header
+        if last_modified is not None:
+            headers["Last-Modified"] = last_modified
+        return headers
+
+    def matches(self, request: Request) -> bool:
+        # If-None-Match tem precedência; If-Modified-Since só sem ele
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            candidates = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in candidates or any(_strip_weak(tag) == _strip_weak(self.etag) for tag in candidates)
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = _as_utc(parsedate_to_datetime(if_modified_since))
+            except (TypeError, ValueError):
+                return False
+            # 304 só se a última escrita for pelo menos um segundo inteiro
+            # anterior à data: uma escrita no mesmo segundo da data não fica
+            # escondida. Datas no futuro são ignoradas
+            if since > self.now:
+                return False
+            return self.last_modified <= since - IF_MODIFIED_SINCE_MARGIN
+        return False
+
+    def not_modified(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
+
+    def apply(self, response: Response) -> Response:
+        response.headers.update(self.headers)
+        return response
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+def transaction_validators(request: Request, user_id: int, version, day: Optional[date] = None) -> Validators:
+    # version: linha (transactions_version, transactions_changed_at). day:
+    # respostas que também mudam com a data (ocorrências de recorrentes)
+    number, changed_at = version if version is not None else (0, None)
+    key = f"{user_id}:{number}:{request.url.path}?{request.url.query}"
+    if day is not None:
+        key += f":{day.isoformat()}"
+        midnight = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        changed_at = midnight if changed_at is None else max(_as_utc(changed_at), midnight)
+    etag = '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+    return Validators(etag, changed_at)
@@ -0,0 +1,11 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+# As datas são gravadas sem fuso (UTC implícito). Datas com fuso vindas da
+# API ou de arquivos importados são levadas para UTC antes de comparar,
+# gravar ou calcular fingerprints.
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,40 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from pydantic import Field, PlainSerializer
+from typing_extensions import Annotated
+
+# Valores monetários: gravados como inteiros em unidades menores (centavos,
+# BIGINT) com o código da moeda, e expostos na API como decimais de duas
+# casas. Somas e médias são feitas sobre inteiros, sem erro de arredondamento.
+
+MINOR_UNITS = 100
+DEFAULT_CURRENCY = "BRL"
+
+# Decimal na validação, número no JSON (como antes); até 15 dígitos para o
+# float da saída representar o valor exato
+Money = Annotated[
+    Decimal,
+    Field(max_digits=15, decimal_places=2),
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
+
+Currency = Annotated[str, Field(pattern="^[A-Z]{3}$")]
+
+def to_cents(value) -> int:
+    # Decimal, int, str ou float (pelo texto, 0.1 -> 10) -> centavos
+    if isinstance(value, float):
+        value = repr(value)
+    return int(Decimal(value).scaleb(2).to_integral_value(ROUND_HALF_UP))
+
+def from_cents(cents) -> Decimal:
+    return Decimal(int(cents)).scaleb(-2)
+
+def cents_to_float(cents) -> float:
+    # Para o orjson/numpy: n / 100 é o float mais próximo do decimal, e o
+    # JSON sai com as mesmas duas casas
+    return int(cents) / MINOR_UNITS
+
+def average_cents(total: int, count: int) -> int:
+    if not count:
+        return 0
+    return int((Decimal(int(total)) / count).to_integral_value(ROUND_HALF_UP))
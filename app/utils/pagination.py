@@ -0,0 +1,37 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+# Cursor opaco para paginação por keyset: codifica a chave (date, id)
+# da última linha entregue, na mesma ordem do índice (user_id, date, id).
+
+def _encode(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+def encode_cursor(date: datetime, id: int) -> str:
+    return _encode({"d": date.isoformat(), "i": id})
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        data = _decode(cursor)
+        return datetime.fromisoformat(data["d"]), int(data["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+# Busca textual: a chave é (relevância, id), ordenada de forma decrescente
+
+def encode_rank_cursor(rank: float, id: int) -> str:
+    return _encode({"r": rank, "i": id})
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        data = _decode(cursor)
+        return float(data["r"]), int(data["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
@@ -0,0 +1,49 @@
+import re
+import unicodedata
+from typing import List
+
+from sqlalchemy import func
+
+# Busca textual em descrição + categoria, sem acentos e por prefixo.
+# PostgreSQL: coluna gerada transactions.search_vector (tsvector 'simple'
+# sobre a descrição sem acentos; translate() é IMMUTABLE e nativo, então
+# não depende da extensão unaccent) com índice GIN. SQLite: tabela FTS5 com
+# remove_diacritics. Os nomes de categoria ficam em outra tabela e são
+# poucos por usuário: casam com os termos aqui mesmo (category_terms).
+
+ACCENTED = "áàâãäåéèêëíìîïóòôõöúùûüçñýÿÁÀÂÃÄÅÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑÝ"
+UNACCENTED = "aaaaaaeeeeiiiiooooouuuucnyyaaaaaaeeeeiiiiooooouuuucny"
+
+MAX_TERMS = 8
+
+_TERM = re.compile(r"[a-z0-9]+")
+
+def fold(text: str) -> str:
+    # "Pão de Açúcar" -> "pao de acucar"
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+def search_terms(query: str) -> List[str]:
+    return _TERM.findall(fold(query))[:MAX_TERMS]
+
+def search_document_sql(text: str) -> str:
+    return f"to_tsvector('simple', translate(lower({text}), '{ACCENTED}', '{UNACCENTED}'))"
+
+SEARCH_DOCUMENT_SQL = search_document_sql("description")
+
+def category_terms(name: str, terms: List[str]) -> frozenset:
+    # Termos que casam (por prefixo) com alguma palavra do nome
+    words = _TERM.findall(fold(name))
+    return frozenset(term for term in terms if any(word.startswith(term) for word in words))
+
+def search_document(column):
+    # Mesmo documento de SEARCH_DOCUMENT_SQL, para uma expressão qualquer
+    return func.to_tsvector("simple", func.translate(func.lower(column), ACCENTED, UNACCENTED))
+
+def to_tsquery(terms: List[str]):
+    # Todos os termos, cada um como prefixo: "mer ext" -> mer:* & ext:*
+    return func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+
+def fts5_match(terms: List[str], operator: str = "AND") -> str:
+    # Sintaxe do FTS5: "mer"* AND "ext"*
+    return f" {operator} ".join(f'"{term}"*' for term in terms)
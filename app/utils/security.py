@@ -1,31 +1,135 @@
+import asyncio
+import hmac
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import settings
 from ..models.user import User
-from ..schemas import TokenData
-from ..database import get_db
+from ..schemas import Principal, TokenData
+from ..database import AsyncSessionLocal
+from .cache import TTLCache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+class PasswordHasher:
+    # Executa o bcrypt em um pool de threads próprio e limitado, fora do event
+    # loop. Acima de max_queue operações pendentes responde 503 em vez de
+    # acumular logins e degradar as demais rotas.
+
+    def __init__(self, rounds: int, workers: int, max_queue: int):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_queue = max_queue
+        # min/max iguais ao custo atual: hashes com outro custo precisam de update
+        self.context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _run(self, fn, *args):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def _done(self, future: Future):
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service busy, try again later",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        future = self._executor.submit(self._run, fn, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def hash(self, password: str) -> str:
+        return self._submit(self.context.hash, password).result()
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._submit(self.context.verify, password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(self.context.hash, password))
+
+    async def verify_and_update_async(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await asyncio.wrap_future(
+            self._submit(self.context.verify_and_update, password, hashed_password)
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rounds": self.rounds,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": self._pending - self._running,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Tokens já validados -> Principal; evita consultar a tabela users a cada requisição
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
+async def _get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = await _get_user_by_email(db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await password_hasher.verify_and_update_async(password, user.hashed_password)
+    if not valid:
         return False
+    if new_hash:
+        # Custo do bcrypt mudou: atualiza o hash de forma transparente
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -38,7 +142,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def invalidate_principal(user_id: int):
+    principal_cache.discard_where(lambda principal: principal.id == user_id)
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -52,12 +163,25 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.email == token_data.email).first()
+    # Sessão curta: a conexão volta ao pool antes de a rota começar a executar
+    async with AsyncSessionLocal() as db:
+        user = await _get_user_by_email(db, token_data.email)
     if user is None:
         raise credentials_exception
-    return user
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)):
+    principal = Principal(id=user.id, email=user.email, is_active=user.is_active)
+    # Nunca mantém no cache um token além da sua própria expiração
+    expires_in = payload.get("exp", 0) - time.time()
+    principal_cache.set(token, principal, ttl=expires_in)
+    return principal
+
+async def get_current_active_user(current_user: Principal = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
\ No newline at end of file
+    return current_user
+
+def verify_internal_token(x_internal_token: Optional[str] = Header(None)):
+    # Fechado por padrão: sem INTERNAL_TOKEN configurado, ou com o header
+    # errado, as rotas internas respondem como se não existissem
+    if not settings.INTERNAL_TOKEN or not hmac.compare_digest(x_internal_token or "", settings.INTERNAL_TOKEN):
+        raise HTTPException(status_code=404, detail="Not Found")
\ No newline at end of file
@@ -0,0 +1,51 @@
+from operator import attrgetter
+from typing import Iterable, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from ..schemas.transaction import Transaction as TransactionSchema
+from .money import MINOR_UNITS
+
+# Caminho rápido de serialização para listas de transações: as linhas do
+# ORM já têm os tipos do schema, então vão direto para o orjson, sem a
+# validação pydantic + jsonable_encoder que o response_model faria.
+
+# Mesma ordem de campos da resposta validada
+TRANSACTION_FIELDS = tuple(TransactionSchema.model_fields)
+
+def _amount(transaction) -> float:
+    # Número com as duas casas do decimal, como na resposta validada
+    return transaction.amount_cents / MINOR_UNITS
+
+TRANSACTION_GETTERS = tuple(
+    (field, _amount if field == "amount" else attrgetter(field)) for field in TRANSACTION_FIELDS
+)
+
+class ORJSONResponse(JSONResponse):
+    # OPT_UTC_Z: datetimes em UTC saem com "Z", como no pydantic
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+def transaction_to_dict(transaction) -> dict:
+    return {field: get(transaction) for field, get in TRANSACTION_GETTERS}
+
+def transactions_to_columns(transactions: Iterable) -> dict:
+    # Formato colunar: um array por campo, sem repetir as chaves por linha
+    columns = {field: [] for field in TRANSACTION_FIELDS}
+    appends = [(get, columns[field].append) for field, get in TRANSACTION_GETTERS]
+    for transaction in transactions:
+        for get, append in appends:
+            append(get(transaction))
+    return columns
+
+def _encode_items(transactions, response_format: str):
+    if response_format == "columnar":
+        return transactions_to_columns(transactions)
+    return [transaction_to_dict(transaction) for transaction in transactions]
+
+def transaction_list_response(transactions, response_format: str = "json") -> ORJSONResponse:
+    return ORJSONResponse(_encode_items(transactions, response_format))
+
+def transaction_page_response(transactions, next_cursor: Optional[str], response_format: str = "json") -> ORJSONResponse:
+    return ORJSONResponse({"items": _encode_items(transactions, response_format), "next_cursor": next_cursor})
@@ -0,0 +1,299 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+
+# Benchmark reprodutível dos endpoints: sobe app.main:app no mesmo processo
+# (transporte ASGI do httpx, sem rede), popula um banco descartável com
+# benchmarks.seed e mede latência (p50/p95/p99), vazão e consultas SQL por
+# requisição de cada cenário. O resultado é salvo em JSON para comparação.
+#
+#   python -m benchmarks.run --database-url sqlite:///./benchmarks/bench.db
+#   python -m benchmarks.run --compare benchmarks/results/a.json benchmarks/results/b.json
+
+SCENARIOS = ("login", "list_shallow", "list_deep", "page_deep", "get", "create", "update", "delete")
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+class QueryCounter:
+    def __init__(self, engines):
+        from sqlalchemy import event
+
+        self.count = 0
+        for engine in engines:
+            event.listen(engine, "after_cursor_execute", self._increment)
+
+    def _increment(self, *args):
+        self.count += 1
+
+async def run_scenario(
+    name: str,
+    make_request: Callable[[int], Awaitable],
+    requests: int,
+    concurrency: int,
+    counter: QueryCounter,
+) -> dict:
+    latencies = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            started = time.perf_counter()
+            response = await make_request(index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    queries_before = counter.count
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    queries = counter.count - queries_before
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "queries_per_request": round(queries / requests, 2) if requests else 0.0,
+    }
+
+async def run(args) -> dict:
+    import httpx
+    from sqlalchemy import func, select
+
+    from app.database import Base, SessionLocal, async_engine, engine
+    from app.main import app
+    from app.models.transaction import Transaction
+    from app.utils.pagination import encode_cursor
+
+    from .seed import BENCH_PASSWORD, seed
+
+    if not args.skip_seed:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        db = SessionLocal()
+        try:
+            seed(db, args.users, args.transactions, seed_value=args.seed)
+        finally:
+            db.close()
+
+    rng = random.Random(args.seed)
+    db = SessionLocal()
+    try:
+        user_ids = [row[0] for row in db.execute(select(Transaction.user_id).distinct())]
+        owned = {
+            user_id: [row[0] for row in db.execute(select(Transaction.id).where(Transaction.user_id == user_id))]
+            for user_id in user_ids
+        }
+        depth = max(0, min(len(ids) for ids in owned.values()) - args.page_size)
+        deep_cursors = {}
+        for user_id in user_ids:
+            row = db.execute(
+                select(Transaction.date, Transaction.id)
+                .where(Transaction.user_id == user_id)
+                .order_by(Transaction.date.desc(), Transaction.id.desc())
+                .offset(max(0, depth - 1))
+                .limit(1)
+            ).first()
+            deep_cursors[user_id] = encode_cursor(row.date, row.id)
+        emails = {user_id: f"bench{index}@example.com" for index, user_id in enumerate(sorted(user_ids))}
+        total_rows = db.execute(select(func.count(Transaction.id))).scalar_one()
+    finally:
+        db.close()
+
+    counter = QueryCounter([engine, async_engine.sync_engine])
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = {}
+        for user_id, email in emails.items():
+            response = await client.post("/token", data={"username": email, "password": BENCH_PASSWORD})
+            response.raise_for_status()
+            headers[user_id] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        created: List[tuple] = []
+
+        def pick_user():
+            return rng.choice(user_ids)
+
+        def new_transaction():
+            return {
+                "amount": round(rng.uniform(5, 500), 2),
+                "description": "Benchmark",
+                "type": "expense",
+                "date": datetime.now().replace(microsecond=0).isoformat(),
+                "category": "Outros",
+            }
+
+        async def login(index):
+            user_id = pick_user()
+            return await client.post("/token", data={"username": emails[user_id], "password": BENCH_PASSWORD})
+
+        async def list_shallow(index):
+            return await client.get("/transactions/", params={"limit": args.page_size}, headers=headers[pick_user()])
+
+        async def list_deep(index):
+            return await client.get(
+                "/transactions/", params={"skip": depth, "limit": args.page_size}, headers=headers[pick_user()]
+            )
+
+        async def page_deep(index):
+            user_id = pick_user()
+            return await client.get(
+                "/transactions/page",
+                params={"cursor": deep_cursors[user_id], "limit": args.page_size},
+                headers=headers[user_id],
+            )
+
+        async def get(index):
+            user_id = pick_user()
+            return await client.get(f"/transactions/{rng.choice(owned[user_id])}", headers=headers[user_id])
+
+        async def create(index):
+            user_id = pick_user()
+            response = await client.post("/transactions/", json=new_transaction(), headers=headers[user_id])
+            if response.status_code < 400:
+                created.append((user_id, response.json()["id"]))
+            return response
+
+        async def update(index):
+            user_id = pick_user()
+            return await client.put(
+                f"/transactions/{rng.choice(owned[user_id])}",
+                json={"amount": round(rng.uniform(5, 500), 2)},
+                headers=headers[user_id],
+            )
+
+        async def delete(index):
+            user_id, transaction_id = created.pop()
+            return await client.delete(f"/transactions/{transaction_id}", headers=headers[user_id])
+
+        handlers = {
+            "login": login,
+            "list_shallow": list_shallow,
+            "list_deep": list_deep,
+            "page_deep": page_deep,
+            "get": get,
+            "create": create,
+            "update": update,
+            "delete": delete,
+        }
+
+        results = {}
+        for name in args.scenarios:
+            requests = args.requests
+            if name == "login":
+                requests = min(requests, args.login_requests)
+            if name == "delete":
+                # Só apaga o que o cenário create criou
+                requests = min(requests, len(created))
+                if not requests:
+                    continue
+            if args.warmup and name != "delete":
+                await run_scenario(name, handlers[name], min(args.warmup, requests), args.concurrency, counter)
+            results[name] = await run_scenario(name, handlers[name], requests, args.concurrency, counter)
+            print(f"{name:>13}: " + ", ".join(f"{key}={value}" for key, value in results[name].items()))
+
+    return {
+        "label": args.label,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "database": engine.dialect.name,
+        "config": {
+            "users": len(user_ids),
+            "transactions": total_rows,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "page_size": args.page_size,
+            "deep_offset": depth,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(paths: List[str]):
+    runs = []
+    for path in paths:
+        with open(path) as handle:
+            runs.append(json.load(handle))
+    base = runs[0]
+    metrics = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "queries_per_request")
+    print(f"base: {paths[0]} ({base.get('label') or base.get('git_commit')})")
+    for path, other in zip(paths[1:], runs[1:]):
+        print(f"\nvs {path} ({other.get('label') or other.get('git_commit')})")
+        for name, result in other["scenarios"].items():
+            reference = base["scenarios"].get(name)
+            if reference is None:
+                continue
+            deltas = []
+            for metric in metrics:
+                before, after = reference[metric], result[metric]
+                change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+                deltas.append(f"{metric}={after} ({change})")
+            print(f"{name:>13}: " + ", ".join(deltas))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos endpoints da FinWise API.")
+    parser.add_argument("--database-url", default="sqlite:///./benchmarks/bench.db")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--transactions", type=int, default=20000, help="transações por usuário")
+    parser.add_argument("--requests", type=int, default=500, help="requisições por cenário")
+    parser.add_argument("--login-requests", type=int, default=50, help="limite para o cenário login (bcrypt)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--skip-seed", action="store_true", help="reutiliza os dados já presentes no banco")
+    parser.add_argument("--label", default=None)
+    parser.add_argument("--output", default=None, help="arquivo JSON (padrão: benchmarks/results/<data>.json)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT", help="compara resultados salvos (o primeiro é a base)")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.compare)
+        return
+
+    # Sempre explícita: o .env pode apontar para o banco de produção
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    result = asyncio.run(run(args))
+
+    output = args.output or os.path.join(
+        "benchmarks", "results", datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(result, handle, indent=2)
+    print(f"\nresults saved to {output}")
+
+if __name__ == "__main__":
+    main()
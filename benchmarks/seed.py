@@ -0,0 +1,166 @@
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+# Gerador de dados sintéticos para benchmarks: usuários com históricos de
+# transações com distribuição realista de datas, categorias, valores e
+# recorrências. Nunca use contra o banco de produção.
+
+BENCH_PASSWORD = "Bench123!"
+
+# (categoria, peso, mediana do valor, dispersão log-normal, estabelecimentos)
+EXPENSE_CATEGORIES = [
+    ("Alimentação", 30, 45.0, 0.8, ["Mercado Extra", "Pão de Açúcar", "iFood", "Padaria Real", "Restaurante Sabor"]),
+    ("Transporte", 20, 25.0, 0.6, ["Uber", "99", "Posto Shell", "Metrô", "Estacionamento"]),
+    ("Compras", 15, 150.0, 1.0, ["Mercado Livre", "Amazon", "Magazine Luiza", "Renner"]),
+    ("Lazer", 12, 80.0, 0.9, ["Cinemark", "Spotify", "Bar do Zé", "Ingresso.com"]),
+    ("Outros", 8, 60.0, 1.0, ["Pix", "Transferência", "Saque"]),
+    ("Saúde", 6, 120.0, 0.9, ["Drogasil", "Unimed", "Clínica Vida"]),
+    ("Educação", 4, 300.0, 0.5, ["Udemy", "Alura", "Livraria Cultura"]),
+]
+
+# (categoria, tipo, descrição, valor)
+RECURRING_ITEMS = [
+    ("Moradia", "expense", "Aluguel", 1800.0),
+    ("Moradia", "expense", "Condomínio", 450.0),
+    ("Lazer", "expense", "Netflix", 55.9),
+    ("Saúde", "expense", "Academia", 99.9),
+]
+
+SALARY = ("Salário", "income", "Salário", 6500.0)
+
+def _random_datetime(rng: random.Random, start: datetime, days: int) -> datetime:
+    # Fins de semana com peso 1.5; horário entre 8h e 22h
+    while True:
+        day = start + timedelta(days=rng.randrange(days))
+        if day.weekday() >= 5 or rng.random() < 1 / 1.5:
+            break
+    return day.replace(hour=rng.randint(8, 21), minute=rng.randrange(60), second=rng.randrange(60))
+
+def generate_transactions(rng: random.Random, user_id: int, count: int, start: datetime, days: int) -> Iterator[dict]:
+    weights = [category[1] for category in EXPENSE_CATEGORIES]
+    emitted = 0
+
+    # Recorrentes: gravadas uma única vez, como no app
+    for category, kind, description, amount in rng.sample(RECURRING_ITEMS, k=rng.randint(1, len(RECURRING_ITEMS))):
+        if emitted >= count:
+            return
+        yield {
+            "user_id": user_id,
+            "amount_cents": round(amount * rng.uniform(0.9, 1.1) * 100),
+            "description": description,
+            "type": kind,
+            "date": start.replace(hour=9, minute=0, second=0),
+            "is_recurring": True,
+            "category": category,
+            "end_date": None if rng.random() < 0.7 else start + timedelta(days=rng.randint(180, 720)),
+        }
+        emitted += 1
+
+    # Salário mensal
+    month = start.replace(day=5, hour=8, minute=0, second=0, microsecond=0)
+    while month < start + timedelta(days=days) and emitted < count:
+        yield {
+            "user_id": user_id,
+            "amount_cents": round(SALARY[3] * 100),
+            "description": SALARY[2],
+            "type": SALARY[1],
+            "date": month,
+            "is_recurring": False,
+            "category": SALARY[0],
+            "end_date": None,
+        }
+        emitted += 1
+        month = (month.replace(day=28) + timedelta(days=8)).replace(day=5)
+
+    while emitted < count:
+        category, _, median, sigma, merchants = rng.choices(EXPENSE_CATEGORIES, weights=weights)[0]
+        yield {
+            "user_id": user_id,
+            "amount_cents": round(rng.lognormvariate(0, sigma) * median * 100),
+            "description": rng.choice(merchants),
+            "type": "expense",
+            "date": _random_datetime(rng, start, days),
+            "is_recurring": False,
+            "category": category,
+            "end_date": None,
+        }
+        emitted += 1
+
+def seed(db, users: int, transactions_per_user: int, days: int = 730, seed_value: int = 42, batch_size: int = 5000) -> List[int]:
+    from sqlalchemy import insert
+
+    from app.models.category import Category
+    from app.models.transaction import Transaction
+    from app.models.user import User
+    from app.utils.security import get_password_hash
+
+    rng = random.Random(seed_value)
+    # Um único hash para todos: bcrypt por usuário dominaria o tempo de carga
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    start = datetime.now().replace(microsecond=0) - timedelta(days=days)
+
+    user_ids = []
+    for index in range(users):
+        user_id = db.execute(
+            insert(User).returning(User.id),
+            {
+                "first_name": "Bench",
+                "last_name": "User",
+                "email": f"bench{index}@example.com",
+                "birthday": datetime(1990, 1, 1).date(),
+                "hashed_password": hashed_password,
+                "is_active": True,
+            },
+        ).scalar_one()
+        user_ids.append(user_id)
+
+        # Categorias do usuário: nome -> id, criadas no primeiro uso
+        category_ids = {}
+        batch = []
+        for row in generate_transactions(rng, user_id, transactions_per_user, start, days):
+            name = row.pop("category")
+            if name not in category_ids:
+                category_ids[name] = db.execute(
+                    insert(Category).returning(Category.id), {"user_id": user_id, "name": name}
+                ).scalar_one()
+            row["category_id"] = category_ids[name]
+            batch.append(row)
+            if len(batch) >= batch_size:
+                db.execute(insert(Transaction), batch)
+                batch = []
+        if batch:
+            db.execute(insert(Transaction), batch)
+        db.commit()
+    return user_ids
+
+def main():
+    parser = argparse.ArgumentParser(description="Popula um banco de benchmark com dados sintéticos.")
+    parser.add_argument("--database-url", default="sqlite:///./benchmarks/bench.db")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--transactions", type=int, default=10000, help="transações por usuário")
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Sempre explícita: o .env pode apontar para o banco de produção
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from app.database import Base, SessionLocal, engine
+    from app.models import budget, category, transaction, user  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        seed(db, args.users, args.transactions, days=args.days, seed_value=args.seed)
+    finally:
+        db.close()
+    print(f"{args.users} users x {args.transactions} transactions in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Tempo de inicialização a frio: cada amostra é um processo Python novo que
+# importa a aplicação e atende a primeira requisição (GET /) direto pela
+# interface ASGI. A referência é o custo de importar uvicorn + FastAPI e
+# criar uma aplicação vazia. Também conta as conexões abertas com o banco
+# durante a inicialização, que devem ser zero.
+#
+#   python -m benchmarks.startup --runs 20
+
+_BASELINE = """
+import json, time
+started = time.perf_counter()
+import uvicorn
+from fastapi import FastAPI
+FastAPI()
+print(json.dumps({"import_s": time.perf_counter() - started}))
+"""
+
+_APP = """
+import asyncio, json, time
+started = time.perf_counter()
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+connections = 0
+
+def _count(*args):
+    global connections
+    connections += 1
+
+event.listen(Pool, "connect", _count)
+
+import uvicorn
+from app.main import app
+imported = time.perf_counter()
+
+async def first_request():
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/", "raw_path": b"/", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"startup")], "client": ("127.0.0.1", 0), "server": ("startup", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+status = asyncio.run(first_request())
+print(json.dumps({
+    "import_s": imported - started,
+    "first_response_s": time.perf_counter() - started,
+    "status": status,
+    "db_connections": connections,
+}))
+"""
+
+def _sample(code: str, env: dict) -> dict:
+    output = subprocess.check_output([sys.executable, "-c", code], env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+def _summary(samples, key: str) -> dict:
+    values = sorted(sample[key] for sample in samples)
+    return {
+        "median_ms": round(statistics.median(values) * 1000, 1),
+        "min_ms": round(values[0] * 1000, 1),
+        "max_ms": round(values[-1] * 1000, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o tempo de inicialização a frio da FinWise API.")
+    parser.add_argument("--database-url", default="sqlite:///./benchmarks/startup.db")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", default=None, help="arquivo JSON com o resultado")
+    args = parser.parse_args()
+
+    # Sempre explícita: o .env pode apontar para o banco de produção
+    env = dict(os.environ, DATABASE_URL=args.database_url)
+    env.pop("ASYNC_DATABASE_URL", None)
+    env.setdefault("SECRET_KEY", "benchmark")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+
+    # Uma execução descartada de cada para aquecer o cache de bytecode/disco
+    _sample(_BASELINE, env)
+    _sample(_APP, env)
+    baseline = [_sample(_BASELINE, env) for _ in range(args.runs)]
+    samples = [_sample(_APP, env) for _ in range(args.runs)]
+
+    result = {
+        "runs": args.runs,
+        "python": sys.version.split()[0],
+        "baseline_import": _summary(baseline, "import_s"),
+        "app_import": _summary(samples, "import_s"),
+        "first_response": _summary(samples, "first_response_s"),
+        "statuses": sorted({sample["status"] for sample in samples}),
+        "db_connections": max(sample["db_connections"] for sample in samples),
+    }
+    result["overhead_ms"] = round(result["app_import"]["median_ms"] - result["baseline_import"]["median_ms"], 1)
+
+    for key in ("baseline_import", "app_import", "first_response"):
+        print(f"{key:>16}: " + ", ".join(f"{name}={value}" for name, value in result[key].items()))
+    print(f"{'overhead':>16}: {result['overhead_ms']} ms over uvicorn + FastAPI")
+    print(f"{'db_connections':>16}: {result['db_connections']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as handle:
+            json.dump(result, handle, indent=2)
+    if result["db_connections"]:
+        sys.exit("the application opened database connections during startup")
+
+if __name__ == "__main__":
+    main()
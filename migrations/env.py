@@ -0,0 +1,75 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.config import settings
+from app.database import Base
+from app.models import budget, category, transaction, user  # noqa: F401  (registra as tabelas no metadata)
+from app.services.partitions import DEFAULT_PARTITION, PARTITION_NAME
+
+# Migrações versionadas do schema; rodam como um passo separado do deploy
+# (`alembic upgrade head`), nunca na inicialização da aplicação.
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Objetos da busca textual fora dos models (DDL próprio, ver
+# app/models/transaction.py): tabelas FTS5 do SQLite (da tabela quente e do
+# arquivo) e a coluna/índices do PostgreSQL
+SEARCH_TABLE_PREFIXES = ("transactions_fts", "transactions_archive_fts")
+SEARCH_OBJECTS = (
+    ("column", "search_vector"),
+    ("index", "ix_transactions_search"),
+    ("index", "ix_transactions_archive_search"),
+)
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith(SEARCH_TABLE_PREFIXES):
+        return False
+    if (type_, name) in SEARCH_OBJECTS:
+        return False
+    # Partições de transactions no PostgreSQL (0010, app/services/partitions.py):
+    # criadas pelo comando partitions, com índices herdados da tabela particionada
+    table = object if type_ == "table" else getattr(object, "table", None)
+    if table is not None and (table.name == DEFAULT_PARTITION or PARTITION_NAME.match(table.name)):
+        return False
+    return True
+
+def _url():
+    return config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+def run_migrations_offline():
+    # Gera o SQL sem conectar: `alembic upgrade head --sql`
+    url = _url()
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+        render_as_batch=url.startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    connectable = create_engine(_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite não suporta a maioria dos ALTER TABLE: recria a tabela
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
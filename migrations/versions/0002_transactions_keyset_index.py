@@ -0,0 +1,31 @@
+"""transactions keyset index
+
+Índice composto da paginação por cursor (GET /transactions/page).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Bancos criados por create_all depois da paginação por cursor já têm o índice
+    # (no modo --sql não há conexão para inspecionar)
+    if not op.get_context().as_sql:
+        existing = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("transactions")}
+        if "ix_transactions_user_date_id" in existing:
+            return
+    op.create_index("ix_transactions_user_date_id", "transactions", ["user_id", "date", "id"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_transactions_user_date_id", table_name="transactions")
@@ -0,0 +1,41 @@
+"""transactions filter indexes
+
+Índices compostos dos filtros de GET /transactions (categoria, tipo,
+valor e recorrentes).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_transactions_user_category_date", "transactions", ["user_id", "category", "date", "id"], unique=False
+    )
+    op.create_index("ix_transactions_user_type_date", "transactions", ["user_id", "type", "date", "id"], unique=False)
+    op.create_index("ix_transactions_user_amount", "transactions", ["user_id", "amount"], unique=False)
+    op.create_index(
+        "ix_transactions_user_recurring_date",
+        "transactions",
+        ["user_id", "date", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_recurring IS true"),
+        sqlite_where=sa.text("is_recurring IS 1"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_transactions_user_recurring_date", table_name="transactions")
+    op.drop_index("ix_transactions_user_amount", table_name="transactions")
+    op.drop_index("ix_transactions_user_type_date", table_name="transactions")
+    op.drop_index("ix_transactions_user_category_date", table_name="transactions")
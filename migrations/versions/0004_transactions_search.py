@@ -0,0 +1,77 @@
+"""transactions search
+
+Busca textual em description + category (GET /transactions/search).
+PostgreSQL: coluna gerada search_vector (tsvector sem acentos) com índice
+GIN. Adicionar a coluna reescreve a tabela sob lock exclusivo; em bancos
+grandes, rode fora do horário de pico. SQLite: tabela FTS5 de conteúdo
+externo mantida por triggers.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# Igual a app.utils.search.SEARCH_DOCUMENT_SQL
+SEARCH_DOCUMENT = (
+    "to_tsvector('simple', translate(lower(description || ' ' || category), "
+    "'áàâãäåéèêëíìîïóòôõöúùûüçñýÿÁÀÂÃÄÅÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑÝ', "
+    "'aaaaaaeeeeiiiiooooouuuucnyyaaaaaaeeeeiiiiooooouuuucny'))"
+)
+
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+    "description, category, content='transactions', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+    "INSERT INTO transactions_fts(rowid, description, category) VALUES (new.id, new.description, new.category); "
+    "END",
+    "CREATE TRIGGER transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description, category) "
+    "VALUES ('delete', old.id, old.description, old.category); "
+    "END",
+    "CREATE TRIGGER transactions_fts_au AFTER UPDATE OF description, category ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description, category) "
+    "VALUES ('delete', old.id, old.description, old.category); "
+    "INSERT INTO transactions_fts(rowid, description, category) VALUES (new.id, new.description, new.category); "
+    "END",
+    # Indexa as linhas existentes
+    "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+)
+
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS transactions_fts_au",
+    "DROP TRIGGER IF EXISTS transactions_fts_ad",
+    "DROP TRIGGER IF EXISTS transactions_fts_ai",
+    "DROP TABLE IF EXISTS transactions_fts",
+)
+
+
+def upgrade():
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            f"ALTER TABLE transactions ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_DOCUMENT}) STORED"
+        )
+        op.execute("CREATE INDEX ix_transactions_search ON transactions USING gin (search_vector)")
+    elif dialect == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_transactions_search")
+        op.execute("ALTER TABLE transactions DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
@@ -0,0 +1,30 @@
+"""users transactions version
+
+Versão e data da última alteração das transações de cada usuário, usadas
+no GET condicional (ETag/Last-Modified) das leituras de transações.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("transactions_version", sa.Integer(), server_default="0", nullable=False))
+        batch_op.add_column(sa.Column("transactions_changed_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("transactions_changed_at")
+        batch_op.drop_column("transactions_version")
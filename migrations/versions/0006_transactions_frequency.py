@@ -0,0 +1,31 @@
+"""transactions frequency
+
+Frequência das transações recorrentes (daily, weekly, monthly, yearly),
+usada na expansão das ocorrências. Linhas existentes ficam mensais.
+Sem batch no SQLite: recriar a tabela apagaria os triggers da busca
+(0004), e ADD/DROP COLUMN são nativos (DROP a partir do SQLite 3.35).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "transactions",
+        sa.Column("frequency", sa.String(length=10), server_default="monthly", nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_column("transactions", "frequency")
@@ -0,0 +1,70 @@
+"""budgets and category spend
+
+Orçamentos mensais por categoria e contadores de gasto por (usuário,
+categoria, mês), preenchidos aqui a partir das transações existentes e
+mantidos depois pelas escritas da aplicação.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# Receitas não contam como gasto (app.crud.transaction.INCOME_TYPES)
+BACKFILL = (
+    "INSERT INTO category_spend (user_id, category, month, spent, count) "
+    "SELECT user_id, category, {month}, SUM(amount), COUNT(*) FROM transactions "
+    "WHERE user_id IS NOT NULL AND type <> 'income' "
+    "GROUP BY user_id, category, {month}"
+)
+
+MONTH = {
+    "postgresql": "CAST(date_trunc('month', date) AS DATE)",
+    "sqlite": "strftime('%Y-%m-01', date)",
+}
+
+
+def upgrade():
+    op.create_table(
+        "budgets",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("category", sa.String(), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("alert_threshold", sa.Float(), server_default="0.8", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "category", name="uq_budgets_user_category"),
+    )
+    op.create_index("ix_budgets_id", "budgets", ["id"], unique=False)
+
+    op.create_table(
+        "category_spend",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("category", sa.String(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("spent", sa.Float(), server_default="0", nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "category", "month"),
+    )
+
+    dialect = op.get_context().dialect.name
+    if dialect in MONTH:
+        op.execute(BACKFILL.format(month=MONTH[dialect]))
+
+
+def downgrade():
+    op.drop_table("category_spend")
+    op.drop_index("ix_budgets_id", table_name="budgets")
+    op.drop_table("budgets")
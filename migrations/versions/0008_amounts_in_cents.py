@@ -0,0 +1,81 @@
+"""amounts in cents
+
+Valores monetários passam de FLOAT para BIGINT em centavos (somas exatas,
+linhas e índices menores), convertendo as linhas existentes no lugar:
+transactions.amount -> amount_cents (com a nova coluna currency),
+budgets.amount -> amount_cents e category_spend.spent -> spent_cents.
+No PostgreSQL é um ALTER COLUMN ... TYPE com USING (uma reescrita da
+tabela, índices refeitos junto). No SQLite, sem batch (recriar
+transactions apagaria os triggers da busca, 0004): coluna nova,
+UPDATE e DROP COLUMN nativo, com o índice de valores recriado.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+# (tabela, coluna em reais, coluna em centavos)
+COLUMNS = (
+    ("transactions", "amount", "amount_cents"),
+    ("budgets", "amount", "amount_cents"),
+    ("category_spend", "spent", "spent_cents"),
+)
+
+
+def _sqlite_swap(table, old, new, type_, value):
+    op.add_column(table, sa.Column(new, type_, server_default="0", nullable=False))
+    op.execute(f"UPDATE {table} SET {new} = {value}")
+    op.drop_column(table, old)
+
+
+def upgrade():
+    sqlite = op.get_context().dialect.name == "sqlite"
+    if sqlite:
+        op.drop_index("ix_transactions_user_amount", table_name="transactions")
+    for table, old, new in COLUMNS:
+        if sqlite:
+            _sqlite_swap(table, old, new, sa.BigInteger(), f"CAST(round({old} * 100) AS INTEGER)")
+        else:
+            # float8 -> numeric preserva as casas decimais digitadas
+            op.alter_column(
+                table,
+                old,
+                type_=sa.BigInteger(),
+                postgresql_using=f"round({old}::numeric * 100)::bigint",
+                new_column_name=new,
+            )
+    if sqlite:
+        op.create_index("ix_transactions_user_amount", "transactions", ["user_id", "amount_cents"])
+    op.add_column(
+        "transactions",
+        sa.Column("currency", sa.String(length=3), server_default="BRL", nullable=False),
+    )
+
+
+def downgrade():
+    sqlite = op.get_context().dialect.name == "sqlite"
+    op.drop_column("transactions", "currency")
+    if sqlite:
+        op.drop_index("ix_transactions_user_amount", table_name="transactions")
+    for table, old, new in COLUMNS:
+        if sqlite:
+            _sqlite_swap(table, new, old, sa.Float(), f"{new} / 100.0")
+        else:
+            op.alter_column(
+                table,
+                new,
+                type_=sa.Float(),
+                postgresql_using=f"{new} / 100.0",
+                new_column_name=old,
+            )
+    if sqlite:
+        op.create_index("ix_transactions_user_amount", "transactions", ["user_id", "amount"])
@@ -0,0 +1,209 @@
+"""categories
+
+Dicionário de categorias por usuário: transactions, budgets e
+category_spend passam a guardar category_id no lugar do nome, que fica
+numa única linha de categories (renomear não reescreve as transações).
+Os nomes existentes são codificados aqui. A busca textual passa a indexar
+só a descrição (o nome da categoria é comparado à parte): no PostgreSQL a
+coluna gerada search_vector é recriada, o que reescreve a tabela; rode
+fora do horário de pico. No SQLite, sem batch em transactions (a FTS e os
+triggers são recriados aqui, mas o índice parcial não seria copiado):
+category_id é adicionada sem FOREIGN KEY, que o SQLite da aplicação não
+verifica. category_spend é recriada e recalculada das transações.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+ACCENTED = "áàâãäåéèêëíìîïóòôõöúùûüçñýÿÁÀÂÃÄÅÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑÝ"
+UNACCENTED = "aaaaaaeeeeiiiiooooouuuucnyyaaaaaaeeeeiiiiooooouuuucny"
+
+# Igual a app.utils.search.SEARCH_DOCUMENT_SQL (antes: description || ' ' || category, 0004)
+SEARCH_DOCUMENT = "to_tsvector('simple', translate(lower({text}), '" + ACCENTED + "', '" + UNACCENTED + "'))"
+
+SQLITE_FTS_DROP = (
+    "DROP TRIGGER IF EXISTS transactions_fts_au",
+    "DROP TRIGGER IF EXISTS transactions_fts_ad",
+    "DROP TRIGGER IF EXISTS transactions_fts_ai",
+    "DROP TABLE IF EXISTS transactions_fts",
+)
+
+def _sqlite_fts(columns):
+    # Tabela FTS5 de conteúdo externo sobre `columns` e triggers (0004)
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    return (
+        f"CREATE VIRTUAL TABLE transactions_fts USING fts5({names}, content='transactions', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+        f"INSERT INTO transactions_fts(rowid, {names}) VALUES (new.id, {new}); "
+        "END",
+        "CREATE TRIGGER transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+        f"INSERT INTO transactions_fts(transactions_fts, rowid, {names}) VALUES ('delete', old.id, {old}); "
+        "END",
+        f"CREATE TRIGGER transactions_fts_au AFTER UPDATE OF {names} ON transactions BEGIN "
+        f"INSERT INTO transactions_fts(transactions_fts, rowid, {names}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO transactions_fts(rowid, {names}) VALUES (new.id, {new}); "
+        "END",
+        "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+    )
+
+def _drop_search(dialect):
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_transactions_search")
+        op.execute("ALTER TABLE transactions DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for statement in SQLITE_FTS_DROP:
+            op.execute(statement)
+
+def _create_search(dialect, text, columns):
+    if dialect == "postgresql":
+        op.execute(
+            "ALTER TABLE transactions ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_DOCUMENT.format(text=text)}) STORED"
+        )
+        op.execute("CREATE INDEX ix_transactions_search ON transactions USING gin (search_vector)")
+    elif dialect == "sqlite":
+        for statement in _sqlite_fts(columns):
+            op.execute(statement)
+
+def _encode(dialect, table):
+    # table.category (nome) -> table.category_id
+    if dialect == "postgresql":
+        op.execute(
+            f"UPDATE {table} SET category_id = c.id FROM categories c "
+            f"WHERE c.user_id = {table}.user_id AND c.name = {table}.category"
+        )
+    else:
+        op.execute(
+            f"UPDATE {table} SET category_id = (SELECT c.id FROM categories c "
+            f"WHERE c.user_id = {table}.user_id AND c.name = {table}.category)"
+        )
+
+def _decode(dialect, table):
+    # table.category_id -> table.category (nome)
+    if dialect == "postgresql":
+        op.execute(f"UPDATE {table} SET category = c.name FROM categories c WHERE c.id = {table}.category_id")
+    else:
+        op.execute(f"UPDATE {table} SET category = (SELECT c.name FROM categories c WHERE c.id = {table}.category_id)")
+
+MONTH = {
+    "postgresql": "CAST(date_trunc('month', date) AS DATE)",
+    "sqlite": "strftime('%Y-%m-01', date)",
+}
+
+# Receitas não contam como gasto (app.crud.transaction.INCOME_TYPES)
+def _backfill_spend(dialect, key):
+    if dialect in MONTH:
+        op.execute(
+            f"INSERT INTO category_spend (user_id, {key}, month, spent_cents, count) "
+            f"SELECT user_id, {key}, {MONTH[dialect]}, SUM(amount_cents), COUNT(*) FROM transactions "
+            f"WHERE user_id IS NOT NULL AND {key} IS NOT NULL AND type <> 'income' "
+            f"GROUP BY user_id, {key}, {MONTH[dialect]}"
+        )
+
+def _create_spend(key_column, key_constraints):
+    op.create_table(
+        "category_spend",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        key_column,
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("spent_cents", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        *key_constraints,
+        sa.PrimaryKeyConstraint("user_id", key_column.name, "month"),
+    )
+
+
+def upgrade():
+    dialect = op.get_context().dialect.name
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "name", name="uq_categories_user_name"),
+    )
+    op.create_index("ix_categories_id", "categories", ["id"], unique=False)
+    op.execute(
+        "INSERT INTO categories (user_id, name) "
+        "SELECT user_id, category FROM transactions WHERE user_id IS NOT NULL "
+        "UNION SELECT user_id, category FROM budgets"
+    )
+
+    # transactions: a busca depende de category; é recriada no fim
+    _drop_search(dialect)
+    op.add_column("transactions", sa.Column("category_id", sa.Integer(), nullable=True))
+    if dialect != "sqlite":
+        op.create_foreign_key("transactions_category_id_fkey", "transactions", "categories", ["category_id"], ["id"])
+    _encode(dialect, "transactions")
+    op.drop_index("ix_transactions_user_category_date", table_name="transactions")
+    op.drop_column("transactions", "category")
+    op.create_index(
+        "ix_transactions_user_category_date", "transactions", ["user_id", "category_id", "date", "id"], unique=False
+    )
+    _create_search(dialect, "description", ["description"])
+
+    # budgets: tabela pequena, batch no SQLite
+    op.add_column("budgets", sa.Column("category_id", sa.Integer(), nullable=True))
+    _encode(dialect, "budgets")
+    with op.batch_alter_table("budgets") as batch_op:
+        batch_op.drop_constraint("uq_budgets_user_category", type_="unique")
+        batch_op.drop_column("category")
+        batch_op.alter_column("category_id", existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key("budgets_category_id_fkey", "categories", ["category_id"], ["id"])
+        batch_op.create_unique_constraint("uq_budgets_user_category", ["user_id", "category_id"])
+
+    # category_spend: derivada das transações, recriada e recalculada
+    op.drop_table("category_spend")
+    _create_spend(
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        [sa.ForeignKeyConstraint(["category_id"], ["categories.id"])],
+    )
+    _backfill_spend(dialect, "category_id")
+
+
+def downgrade():
+    dialect = op.get_context().dialect.name
+    op.drop_table("category_spend")
+    _create_spend(sa.Column("category", sa.String(), nullable=False), [])
+
+    op.add_column("budgets", sa.Column("category", sa.String(), nullable=True))
+    _decode(dialect, "budgets")
+    with op.batch_alter_table("budgets") as batch_op:
+        batch_op.drop_constraint("uq_budgets_user_category", type_="unique")
+        batch_op.drop_constraint("budgets_category_id_fkey", type_="foreignkey")
+        batch_op.drop_column("category_id")
+        batch_op.alter_column("category", existing_type=sa.String(), nullable=False)
+        batch_op.create_unique_constraint("uq_budgets_user_category", ["user_id", "category"])
+
+    _drop_search(dialect)
+    op.add_column("transactions", sa.Column("category", sa.String(), nullable=True))
+    _decode(dialect, "transactions")
+    op.drop_index("ix_transactions_user_category_date", table_name="transactions")
+    op.drop_column("transactions", "category_id")
+    if dialect != "sqlite":
+        op.alter_column("transactions", "category", existing_type=sa.String(), nullable=False)
+    op.create_index(
+        "ix_transactions_user_category_date", "transactions", ["user_id", "category", "date", "id"], unique=False
+    )
+    _create_search(dialect, "description || ' ' || category", ["description", "category"])
+    _backfill_spend(dialect, "category")
+
+    op.drop_index("ix_categories_id", table_name="categories")
+    op.drop_table("categories")
@@ -0,0 +1,236 @@
+"""transactions partitions and archive
+
+Tabela transactions_archive, para onde `python -m app.cli archive` move
+as transações antigas (mesmas colunas e ids, só o índice por período e o
+da busca). No PostgreSQL, transactions passa a ser particionada por mês de
+`date`, com chave primária (id, date): a tabela é recriada e copiada (rode
+numa janela de manutenção), com partições do mês da transação mais antiga
+(no máximo HISTORY_MONTHS atrás) até MONTHS_AHEAD meses à frente e a
+partição padrão para o resto. Depois disso, `python -m app.cli partitions`
+mantém as partições. No SQLite, transactions é recriada com AUTOINCREMENT
+(e a FOREIGN KEY de category_id que a 0009 não criou): sem ele, um id novo
+é max(id) + 1 e poderia repetir o de uma linha arquivada. A busca e os
+índices são refeitos; o downgrade recria a tabela como era na 0009.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 00:00:00
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+HISTORY_MONTHS = 120
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    "id", "amount_cents", "currency", "date", "is_recurring", "frequency", "category_id",
+    "end_date", "description", "type", "user_id", "created_at", "updated_at",
+)
+
+ACCENTED = "áàâãäåéèêëíìîïóòôõöúùûüçñýÿÁÀÂÃÄÅÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑÝ"
+UNACCENTED = "aaaaaaeeeeiiiiooooouuuucnyyaaaaaaeeeeiiiiooooouuuucny"
+
+# Igual a app.utils.search.SEARCH_DOCUMENT_SQL
+SEARCH_DOCUMENT = "to_tsvector('simple', translate(lower(description), '" + ACCENTED + "', '" + UNACCENTED + "'))"
+
+# Índices de transactions (app.models.transaction), recriados com a tabela
+TRANSACTIONS_INDEXES = (
+    "CREATE INDEX ix_transactions_id ON transactions (id)",
+    "CREATE INDEX ix_transactions_user_date_id ON transactions (user_id, date, id)",
+    "CREATE INDEX ix_transactions_user_category_date ON transactions (user_id, category_id, date, id)",
+    "CREATE INDEX ix_transactions_user_type_date ON transactions (user_id, type, date, id)",
+    "CREATE INDEX ix_transactions_user_amount ON transactions (user_id, amount_cents)",
+    "CREATE INDEX ix_transactions_user_recurring_date ON transactions (user_id, date, id) WHERE is_recurring IS true",
+    "CREATE INDEX ix_transactions_search ON transactions USING gin (search_vector)",
+)
+
+SQLITE_TRANSACTIONS_INDEXES = (
+    "CREATE INDEX ix_transactions_id ON transactions (id)",
+    "CREATE INDEX ix_transactions_user_date_id ON transactions (user_id, date, id)",
+    "CREATE INDEX ix_transactions_user_category_date ON transactions (user_id, category_id, date, id)",
+    "CREATE INDEX ix_transactions_user_type_date ON transactions (user_id, type, date, id)",
+    "CREATE INDEX ix_transactions_user_amount ON transactions (user_id, amount_cents)",
+    "CREATE INDEX ix_transactions_user_recurring_date ON transactions (user_id, date, id) WHERE is_recurring IS 1",
+)
+
+# Busca de transactions como na 0009
+SQLITE_FTS_DROP = (
+    "DROP TRIGGER IF EXISTS transactions_fts_au",
+    "DROP TRIGGER IF EXISTS transactions_fts_ad",
+    "DROP TRIGGER IF EXISTS transactions_fts_ai",
+    "DROP TABLE IF EXISTS transactions_fts",
+)
+
+SQLITE_FTS = (
+    "CREATE VIRTUAL TABLE transactions_fts USING fts5(description, content='transactions', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); "
+    "END",
+    "CREATE TRIGGER transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) VALUES ('delete', old.id, old.description); "
+    "END",
+    "CREATE TRIGGER transactions_fts_au AFTER UPDATE OF description ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) VALUES ('delete', old.id, old.description); "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); "
+    "END",
+    "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+)
+
+SQLITE_ARCHIVE_FTS = (
+    "CREATE VIRTUAL TABLE transactions_archive_fts USING fts5(description, content='transactions_archive', "
+    "content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER transactions_archive_fts_ai AFTER INSERT ON transactions_archive BEGIN "
+    "INSERT INTO transactions_archive_fts(rowid, description) VALUES (new.id, new.description); "
+    "END",
+    "CREATE TRIGGER transactions_archive_fts_ad AFTER DELETE ON transactions_archive BEGIN "
+    "INSERT INTO transactions_archive_fts(transactions_archive_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    "END",
+)
+
+SQLITE_ARCHIVE_FTS_DROP = (
+    "DROP TRIGGER IF EXISTS transactions_archive_fts_ad",
+    "DROP TRIGGER IF EXISTS transactions_archive_fts_ai",
+    "DROP TABLE IF EXISTS transactions_archive_fts",
+)
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def _create_partitions():
+    # Partições mensais cobrindo os dados existentes e os próximos meses
+    today = date.today().replace(day=1)
+    oldest = op.get_bind().execute(sa.text("SELECT min(date) FROM transactions_unpartitioned")).scalar()
+    month = max(oldest.date().replace(day=1) if oldest else today, _add_months(today, -HISTORY_MONTHS))
+    while month <= _add_months(today, MONTHS_AHEAD):
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE transactions_y{month.year:04d}m{month.month:02d} PARTITION OF transactions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+
+def _rebuild_transactions(partitioned):
+    # Nova tabela com as mesmas colunas (inclusive search_vector e a
+    # sequência do id), cópia das linhas e índices criados depois da carga
+    op.execute("ALTER TABLE transactions RENAME TO transactions_unpartitioned")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY NONE")
+    op.execute(
+        "CREATE TABLE transactions (LIKE transactions_unpartitioned INCLUDING DEFAULTS INCLUDING GENERATED)"
+        + (" PARTITION BY RANGE (date)" if partitioned else "")
+    )
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    if partitioned:
+        _create_partitions()
+    columns = ", ".join(COLUMNS)
+    op.execute(f"INSERT INTO transactions ({columns}) SELECT {columns} FROM transactions_unpartitioned")
+    op.execute("DROP TABLE transactions_unpartitioned")
+    op.execute(
+        "ALTER TABLE transactions ADD CONSTRAINT transactions_pkey PRIMARY KEY "
+        + ("(id, date)" if partitioned else "(id)")
+    )
+    op.execute(
+        "ALTER TABLE transactions ADD CONSTRAINT transactions_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE"
+    )
+    op.execute(
+        "ALTER TABLE transactions ADD CONSTRAINT transactions_category_id_fkey "
+        "FOREIGN KEY (category_id) REFERENCES categories (id)"
+    )
+    for statement in TRANSACTIONS_INDEXES:
+        op.execute(statement)
+
+def _rebuild_sqlite_transactions(autoincrement):
+    # Sem batch: a cópia do Alembic não refaria a FTS, os triggers nem o
+    # índice parcial. Com autoincrement, o formato desta revisão
+    # (sqlite_sequence parte do maior id copiado); sem ele, o da 0009, sem
+    # a FOREIGN KEY de category_id (que o downgrade da 0009 remove)
+    for statement in SQLITE_FTS_DROP:
+        op.execute(statement)
+    category_fk = [sa.ForeignKeyConstraint(["category_id"], ["categories.id"])] if autoincrement else []
+    op.create_table(
+        "transactions_rebuilt",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("amount_cents", sa.BigInteger(), nullable=False),
+        sa.Column("currency", sa.String(length=3), server_default="BRL", nullable=False),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("is_recurring", sa.Boolean(), nullable=True),
+        sa.Column("frequency", sa.String(length=10), server_default="monthly", nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=True),
+        sa.Column("end_date", sa.DateTime(), nullable=True),
+        sa.Column("description", sa.String(), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        *category_fk,
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=autoincrement,
+    )
+    columns = ", ".join(COLUMNS)
+    op.execute(f"INSERT INTO transactions_rebuilt ({columns}) SELECT {columns} FROM transactions")
+    op.drop_table("transactions")
+    op.rename_table("transactions_rebuilt", "transactions")
+    for statement in SQLITE_TRANSACTIONS_INDEXES + SQLITE_FTS:
+        op.execute(statement)
+
+
+def upgrade():
+    dialect = op.get_context().dialect.name
+    op.create_table(
+        "transactions_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("amount_cents", sa.BigInteger(), nullable=False),
+        sa.Column("currency", sa.String(length=3), server_default="BRL", nullable=False),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("is_recurring", sa.Boolean(), nullable=True),
+        sa.Column("frequency", sa.String(length=10), server_default="monthly", nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=True),
+        sa.Column("end_date", sa.DateTime(), nullable=True),
+        sa.Column("description", sa.String(), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_transactions_archive_user_date_id", "transactions_archive", ["user_id", "date", "id"], unique=False
+    )
+    if dialect == "postgresql":
+        op.execute(f"CREATE INDEX ix_transactions_archive_search ON transactions_archive USING gin (({SEARCH_DOCUMENT}))")
+        _rebuild_transactions(partitioned=True)
+    elif dialect == "sqlite":
+        _rebuild_sqlite_transactions(autoincrement=True)
+        for statement in SQLITE_ARCHIVE_FTS:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_context().dialect.name
+    # As linhas arquivadas voltam para transactions antes de o arquivo sumir
+    columns = ", ".join(COLUMNS)
+    op.execute(f"INSERT INTO transactions ({columns}) SELECT {columns} FROM transactions_archive")
+    if dialect == "postgresql":
+        _rebuild_transactions(partitioned=False)
+    elif dialect == "sqlite":
+        for statement in SQLITE_ARCHIVE_FTS_DROP:
+            op.execute(statement)
+        _rebuild_sqlite_transactions(autoincrement=False)
+    op.drop_index("ix_transactions_archive_user_date_id", table_name="transactions_archive")
+    op.drop_table("transactions_archive")
@@ -0,0 +1,41 @@
+"""account purges
+
+Tabela account_purges: progresso da exclusão em segundo plano de contas
+grandes (DELETE /users/me, `python -m app.cli purge`). As tabelas do
+usuário já têm ON DELETE CASCADE desde as migrações que as criaram.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "account_purges",
+        sa.Column("id", sa.String(length=32), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=10), server_default="pending", nullable=False),
+        sa.Column("total_rows", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("deleted_rows", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_account_purges_user_id", "account_purges", ["user_id"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_account_purges_user_id", table_name="account_purges")
+    op.drop_table("account_purges")
@@ -0,0 +1,72 @@
+"""budgets currency
+
+Orçamentos e contadores de gasto por moeda: budgets ganha currency (os
+existentes ficam em BRL, a moeda padrão) e category_spend passa a ter a
+moeda na chave, para um gasto em USD não contar num orçamento em BRL.
+category_spend é recriada e recalculada das transações, inclusive as
+arquivadas.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+MONTH = {
+    "postgresql": "CAST(date_trunc('month', date) AS DATE)",
+    "sqlite": "strftime('%Y-%m-01', date)",
+}
+
+def _backfill_spend(dialect, keys):
+    # Soma da tabela quente e do arquivo (mesmas colunas)
+    columns = ", ".join(keys)
+    source = (
+        f"SELECT user_id, {columns}, date, amount_cents FROM transactions WHERE type <> 'income' "
+        f"UNION ALL SELECT user_id, {columns}, date, amount_cents FROM transactions_archive WHERE type <> 'income'"
+    )
+    op.execute(
+        f"INSERT INTO category_spend (user_id, {columns}, month, spent_cents, count) "
+        f"SELECT user_id, {columns}, {MONTH[dialect]}, SUM(amount_cents), COUNT(*) FROM ({source}) AS spend "
+        f"GROUP BY user_id, {columns}, {MONTH[dialect]}"
+    )
+
+def _create_spend(*key_columns):
+    op.create_table(
+        "category_spend",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        *key_columns,
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("spent_cents", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.PrimaryKeyConstraint("user_id", "category_id", *(column.name for column in key_columns), "month"),
+    )
+
+
+def upgrade():
+    dialect = op.get_context().dialect.name
+    op.add_column(
+        "budgets", sa.Column("currency", sa.String(length=3), server_default="BRL", nullable=False)
+    )
+    op.drop_table("category_spend")
+    _create_spend(sa.Column("currency", sa.String(length=3), nullable=False))
+    _backfill_spend(dialect, ["category_id", "currency"])
+
+
+def downgrade():
+    dialect = op.get_context().dialect.name
+    op.drop_table("category_spend")
+    _create_spend()
+    _backfill_spend(dialect, ["category_id"])
+    with op.batch_alter_table("budgets") as batch_op:
+        batch_op.drop_column("currency")